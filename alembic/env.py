@@ -8,6 +8,8 @@ from alembic import context
 from app.core.config import settings
 from app.core.database import Base
 from app.models.user_model import UserModel
+from app.models.outbox_model import OutboxEventModel
+from app.models.session_model import UserSessionModel
 
 config = context.config
 
@@ -0,0 +1,28 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    from app.core.security import decrypt_data, compute_cpf_hash
+
+    op.add_column('users', sa.Column('cpf_hash', sa.String(64), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, cpf FROM users WHERE cpf_hash IS NULL")).fetchall()
+    for user_id, encrypted_cpf in rows:
+        conn.execute(
+            sa.text("UPDATE users SET cpf_hash = :cpf_hash WHERE id = :id"),
+            {"cpf_hash": compute_cpf_hash(decrypt_data(encrypted_cpf)), "id": user_id}
+        )
+
+    op.create_index('ix_users_cpf_hash', 'users', ['cpf_hash'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_cpf_hash', table_name='users')
+    op.drop_column('users', 'cpf_hash')
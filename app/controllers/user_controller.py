@@ -1,5 +1,5 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional, Tuple
 from app.schemas.user_schema import User, UserResponse, UserResponsePublic, UserResponseLimited
 from app.services.user_service import UserService
 from app.services.auth_service import AuthService
@@ -20,13 +20,18 @@ class UserController:
         return await AuthService.refresh_access_token(refresh_token, db)
 
     @staticmethod
-    async def logout(user_id: int, db: AsyncSession) -> dict:
-        return await AuthService.logout(user_id, db)
+    async def logout(user_id: int, session_id: Optional[str], db: AsyncSession) -> dict:
+        return await AuthService.logout(user_id, session_id, db)
 
     @staticmethod
     async def get_all_users_public(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[UserResponsePublic]:
         return await UserService.get_all_users_public(db, skip=skip, limit=limit)
 
+    @staticmethod
+    async def get_users_page_public(db: AsyncSession, after_id: int = 0,
+                                    limit: int = 100) -> Tuple[List[UserResponsePublic], Optional[str]]:
+        return await UserService.get_users_page_public(db, after_id=after_id, limit=limit)
+
     @staticmethod
     async def get_user_by_id(user_id: int, db: AsyncSession) -> UserResponse:
         return await UserService.get_user_by_id(user_id, db)
@@ -1,13 +1,27 @@
 import redis.asyncio as redis
-from typing import Optional, Any
-import pickle
+from typing import Optional, Any, Awaitable, Callable, Dict, Tuple
+from collections import OrderedDict
+import asyncio
+import time
+import uuid
 from app.core.config import settings
+from app.core.serialization import CacheSerializer, SerializationError
+from app.core.timing import timed
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
 class RedisCache:
     _instance: Optional[redis.Redis] = None
+    _hits: int = 0
+    _misses: int = 0
 
     @classmethod
     async def get_instance(cls) -> redis.Redis:
@@ -52,11 +66,16 @@ class RedisCache:
 
             value = await client.get(key)
             if value:
+                cls._hits += 1
                 logger.debug("cache_hit", key=key)
-                return pickle.loads(value)
+                return CacheSerializer.loads(value)
 
+            cls._misses += 1
             logger.debug("cache_miss", key=key)
             return None
+        except SerializationError as e:
+            logger.warning("cache_entry_incompatible", key=key, error=str(e))
+            return None
         except Exception as e:
             logger.error("cache_get_error", key=key, error=str(e))
             return None
@@ -68,7 +87,7 @@ class RedisCache:
             if client is None:
                 return False
 
-            serialized = pickle.dumps(value)
+            serialized = CacheSerializer.dumps(value)
             await client.set(key, serialized, ex=expire)
             logger.debug("cache_set", key=key, expire=expire)
             return True
@@ -111,6 +130,51 @@ class RedisCache:
             logger.error("cache_clear_pattern_error", pattern=pattern, error=str(e))
             return 0
 
+    @classmethod
+    async def publish(cls, channel: str, message: str) -> bool:
+        try:
+            client = await cls.get_instance()
+            if client is None:
+                return False
+
+            await client.publish(channel, message)
+            return True
+        except Exception as e:
+            logger.error("cache_publish_error", channel=channel, error=str(e))
+            return False
+
+    @classmethod
+    async def acquire_lock(cls, key: str, token: str, ttl_ms: int) -> Optional[bool]:
+        try:
+            client = await cls.get_instance()
+            if client is None:
+                return None
+
+            return bool(await client.set(key, token, nx=True, px=ttl_ms))
+        except Exception as e:
+            logger.error("cache_lock_acquire_error", key=key, error=str(e))
+            return None
+
+    @classmethod
+    async def release_lock(cls, key: str, token: str) -> None:
+        try:
+            client = await cls.get_instance()
+            if client is None:
+                return
+
+            await client.eval(_RELEASE_LOCK_SCRIPT, 1, key, token)
+        except Exception as e:
+            logger.error("cache_lock_release_error", key=key, error=str(e))
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        total = cls._hits + cls._misses
+        return {
+            "hits": cls._hits,
+            "misses": cls._misses,
+            "hit_ratio": round(cls._hits / total, 4) if total else 0.0,
+        }
+
     @classmethod
     async def close(cls):
         if cls._instance:
@@ -119,6 +183,223 @@ class RedisCache:
             logger.info("redis_connection_closed")
 
 
+class LocalCache:
+    _entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+    _hits: int = 0
+    _misses: int = 0
+    _evictions: int = 0
+
+    @classmethod
+    def get(cls, key: str) -> Optional[Any]:
+        entry = cls._entries.get(key)
+        if entry is None:
+            cls._misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del cls._entries[key]
+            cls._misses += 1
+            return None
+
+        cls._entries.move_to_end(key)
+        cls._hits += 1
+        return value
+
+    @classmethod
+    def set(cls, key: str, value: Any, expire: int, local_ttl: Optional[int] = None) -> None:
+        ttl = min(expire, local_ttl if local_ttl is not None else settings.local_cache_ttl)
+        if ttl <= 0 or settings.local_cache_max_size <= 0:
+            return
+
+        cls._entries[key] = (time.monotonic() + ttl, value)
+        cls._entries.move_to_end(key)
+        while len(cls._entries) > settings.local_cache_max_size:
+            cls._entries.popitem(last=False)
+            cls._evictions += 1
+
+    @classmethod
+    def delete(cls, key: str) -> None:
+        cls._entries.pop(key, None)
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._entries.clear()
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        total = cls._hits + cls._misses
+        return {
+            "size": len(cls._entries),
+            "hits": cls._hits,
+            "misses": cls._misses,
+            "evictions": cls._evictions,
+            "hit_ratio": round(cls._hits / total, 4) if total else 0.0,
+        }
+
+
+class TieredCache:
+    instance_id: str = uuid.uuid4().hex
+    _listener: Optional[asyncio.Task] = None
+
+    @classmethod
+    @timed("cache")
+    async def get(cls, key: str, local_ttl: Optional[int] = None) -> Optional[Any]:
+        value = LocalCache.get(key)
+        if value is not None:
+            return value
+
+        value = await RedisCache.get(key)
+        if value is not None:
+            ttl = local_ttl if local_ttl is not None else settings.local_cache_ttl
+            LocalCache.set(key, value, ttl, local_ttl=ttl)
+        return value
+
+    @classmethod
+    @timed("cache")
+    async def set(cls, key: str, value: Any, expire: int = 300, broadcast: bool = False,
+                  local_ttl: Optional[int] = None) -> bool:
+        LocalCache.set(key, value, expire, local_ttl=local_ttl)
+        stored = await RedisCache.set(key, value, expire)
+        if broadcast:
+            await cls._publish_invalidation(key)
+        return stored
+
+    @classmethod
+    @timed("cache")
+    async def delete(cls, key: str) -> bool:
+        LocalCache.delete(key)
+        deleted = await RedisCache.delete(key)
+        await cls._publish_invalidation(key)
+        return deleted
+
+    @classmethod
+    async def _publish_invalidation(cls, key: str) -> None:
+        await RedisCache.publish(settings.cache_invalidation_channel, f"{cls.instance_id}|{key}")
+
+    @classmethod
+    async def _listen(cls) -> None:
+        while True:
+            pubsub = None
+            try:
+                client = await RedisCache.get_instance()
+                if client is None:
+                    await asyncio.sleep(5)
+                    continue
+
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(settings.cache_invalidation_channel)
+                logger.info("cache_invalidation_listener_started", channel=settings.cache_invalidation_channel)
+
+                async for message in pubsub.listen():
+                    data = message.get("data")
+                    if isinstance(data, bytes):
+                        data = data.decode()
+                    origin, _, key = str(data).partition("|")
+                    if origin != cls.instance_id and key:
+                        LocalCache.delete(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("cache_invalidation_listener_error", error=str(e))
+                LocalCache.clear()
+                await asyncio.sleep(1)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+    @classmethod
+    def start_invalidation_listener(cls) -> None:
+        if cls._listener is None and settings.local_cache_max_size > 0:
+            cls._listener = asyncio.create_task(cls._listen())
+
+    @classmethod
+    async def stop_invalidation_listener(cls) -> None:
+        if cls._listener is not None:
+            cls._listener.cancel()
+            try:
+                await cls._listener
+            except asyncio.CancelledError:
+                pass
+            cls._listener = None
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        return {"l1": LocalCache.stats(), "l2": RedisCache.stats()}
+
+
+class SingleFlight:
+    _inflight: Dict[str, asyncio.Future] = {}
+    _leaders: int = 0
+    _coalesced: int = 0
+    _distributed_waits: int = 0
+
+    @classmethod
+    async def do(cls, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        future = cls._inflight.get(key)
+        if future is not None:
+            cls._coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                return await cls.do(key, loader)
+
+        future = asyncio.get_running_loop().create_future()
+        cls._inflight[key] = future
+        cls._leaders += 1
+        try:
+            result = await cls._load(key, loader)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            cls._inflight.pop(key, None)
+
+    @classmethod
+    async def _load(cls, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if not settings.single_flight_distributed:
+            return await loader()
+
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+        acquired = await RedisCache.acquire_lock(lock_key, token, settings.single_flight_lock_ttl_ms)
+        if acquired is False:
+            cls._distributed_waits += 1
+            deadline = time.monotonic() + settings.single_flight_lock_ttl_ms / 1000
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.025)
+                value = await RedisCache.get(key)
+                if value is not None:
+                    return value
+
+        try:
+            return await loader()
+        finally:
+            if acquired:
+                await RedisCache.release_lock(lock_key, token)
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        return {
+            "inflight": len(cls._inflight),
+            "leaders": cls._leaders,
+            "coalesced": cls._coalesced,
+            "distributed_waits": cls._distributed_waits,
+        }
+
+
 async def get_cache(key: str) -> Optional[Any]:
     return await RedisCache.get(key)
 
@@ -0,0 +1,108 @@
+from typing import Dict
+from app.core.logging import get_logger
+from app.core.metrics import (
+    circuit_breaker_rejections_total,
+    circuit_breaker_state,
+    circuit_breaker_transitions_total
+)
+import time
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuito {name} aberto")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+
+    def __init__(
+            self,
+            name: str,
+            failure_threshold: int = 5,
+            recovery_timeout: float = 30.0,
+            half_open_max_calls: int = 1
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        circuit_breaker_state.set(_STATE_VALUES[CLOSED], name=name)
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def retry_after(self) -> float:
+        if self._state != OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+
+    def before_call(self) -> None:
+        state = self.state
+        if state == CLOSED:
+            return
+        if state == HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+            self._half_open_calls += 1
+            return
+
+        circuit_breaker_rejections_total.inc(name=self.name)
+        raise CircuitOpenError(self.name, self.retry_after() or self.recovery_timeout)
+
+    def record_success(self) -> None:
+        self._failures = 0
+        if self._state != CLOSED:
+            self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        if self._state == HALF_OPEN:
+            self._transition(OPEN)
+            return
+
+        self._failures += 1
+        if self._state == CLOSED and self._failures >= self.failure_threshold:
+            self._transition(OPEN)
+
+    def release(self) -> None:
+        # Chamada cancelada sem resultado: devolve a vaga de teste do estado semiaberto
+        if self._state == HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def reset(self) -> None:
+        self._transition(CLOSED)
+
+    def _transition(self, state: str) -> None:
+        previous = self._state
+        self._state = state
+        self._half_open_calls = 0
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        if state == CLOSED:
+            self._failures = 0
+
+        circuit_breaker_state.set(_STATE_VALUES[state], name=self.name)
+        circuit_breaker_transitions_total.inc(name=self.name, state=state)
+        logger.warning("circuit_breaker_transition", name=self.name, previous=previous, state=state)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "state": self.state,
+            "failures": self._failures,
+            "retry_after": round(self.retry_after(), 3)
+        }
@@ -20,12 +20,36 @@ class Settings(BaseSettings):
         else:
             return f"postgresql+asyncpg://{self.postgres_user}@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
 
+    db_echo: bool = os.getenv("DB_ECHO", "false").lower() == "true"
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+    # Nome do campo difere da variável: o BaseSettings tentaria ler DATABASE_REPLICA_URLS como JSON
+    database_replica_url_list: List[str] = [
+        url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+    ]
+    replica_read_your_writes_seconds: int = int(os.getenv("REPLICA_READ_YOUR_WRITES_SECONDS", "5"))
+    replica_connect_timeout: float = float(os.getenv("REPLICA_CONNECT_TIMEOUT", "2"))
+    replica_unhealthy_backoff: float = float(os.getenv("REPLICA_UNHEALTHY_BACKOFF", "30"))
+
     secret_key: str = os.getenv("SECRET_KEY", "")
     algorithm: str = os.getenv("ALGORITHM", "HS256")
     access_token_expire_minutes: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
     refresh_token_expire_days: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+    session_reuse_grace_seconds: float = float(os.getenv("SESSION_REUSE_GRACE_SECONDS", "10"))
+    session_flush_interval: float = float(os.getenv("SESSION_FLUSH_INTERVAL", "1"))
+    session_flush_batch_size: int = int(os.getenv("SESSION_FLUSH_BATCH_SIZE", "500"))
+    session_purge_interval: float = float(os.getenv("SESSION_PURGE_INTERVAL", "3600"))
+    session_retention_days: int = int(os.getenv("SESSION_RETENTION_DAYS", "7"))
 
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
+    request_timing_enabled: bool = os.getenv("REQUEST_TIMING_ENABLED", "false").lower() == "true"
+    request_timing_sample_rate: float = float(os.getenv("REQUEST_TIMING_SAMPLE_RATE", "0.01"))
+    metrics_enabled: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    metrics_token: str = os.getenv("METRICS_TOKEN", "")
     sentry_dsn: str = os.getenv("SENTRY_DSN", "")
     environment: str = os.getenv("ENVIRONMENT", "development")
 
@@ -43,6 +67,17 @@ class Settings(BaseSettings):
     redis_db: int = int(os.getenv("REDIS_DB", "0"))
     redis_url: str = os.getenv("REDIS_URL", "")
 
+    local_cache_max_size: int = int(os.getenv("LOCAL_CACHE_MAX_SIZE", "1024"))
+    local_cache_ttl: int = int(os.getenv("LOCAL_CACHE_TTL", "30"))
+    cache_invalidation_channel: str = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache:invalidate")
+
+    single_flight_distributed: bool = os.getenv("SINGLE_FLIGHT_DISTRIBUTED", "false").lower() == "true"
+    single_flight_lock_ttl_ms: int = int(os.getenv("SINGLE_FLIGHT_LOCK_TTL_MS", "2000"))
+
+    cache_codec: str = os.getenv("CACHE_CODEC", "json")
+    cache_compression: str = os.getenv("CACHE_COMPRESSION", "none")
+    cache_compression_threshold: int = int(os.getenv("CACHE_COMPRESSION_THRESHOLD", "1024"))
+
     smtp_host: str = os.getenv("SMTP_HOST", "smtp.gmail.com")
     smtp_port: int = int(os.getenv("SMTP_PORT", "587"))
     smtp_username: str = os.getenv("SMTP_USERNAME", "")
@@ -51,6 +86,74 @@ class Settings(BaseSettings):
     smtp_from_name: str = os.getenv("SMTP_FROM_NAME", "FastAPI App")
     smtp_tls: bool = os.getenv("SMTP_TLS", "true").lower() == "true"
     smtp_ssl: bool = os.getenv("SMTP_SSL", "false").lower() == "true"
+    smtp_timeout: float = float(os.getenv("SMTP_TIMEOUT", "30"))
+    smtp_pool_size: int = int(os.getenv("SMTP_POOL_SIZE", "4"))
+    smtp_pool_idle_timeout: float = float(os.getenv("SMTP_POOL_IDLE_TIMEOUT", "60"))
+    smtp_pool_health_check_interval: float = float(os.getenv("SMTP_POOL_HEALTH_CHECK_INTERVAL", "15"))
+    smtp_max_messages_per_connection: int = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100"))
+
+    email_template_dir: str = os.getenv("EMAIL_TEMPLATE_DIR", "")
+    email_template_bytecode_cache: str = os.getenv("EMAIL_TEMPLATE_BYTECODE_CACHE", "")
+    email_template_auto_reload: bool = os.getenv("EMAIL_TEMPLATE_AUTO_RELOAD", "false").lower() == "true"
+    email_default_locale: str = os.getenv("EMAIL_DEFAULT_LOCALE", "pt_BR")
+
+    email_queue_stream: str = os.getenv("EMAIL_QUEUE_STREAM", "email:jobs")
+    email_queue_group: str = os.getenv("EMAIL_QUEUE_GROUP", "email-workers")
+    email_queue_delayed_key: str = os.getenv("EMAIL_QUEUE_DELAYED_KEY", "email:jobs:delayed")
+    email_queue_dead_stream: str = os.getenv("EMAIL_QUEUE_DEAD_STREAM", "email:jobs:dead")
+    email_queue_maxlen: int = int(os.getenv("EMAIL_QUEUE_MAXLEN", "100000"))
+    email_queue_batch_size: int = int(os.getenv("EMAIL_QUEUE_BATCH_SIZE", "10"))
+    email_queue_max_attempts: int = int(os.getenv("EMAIL_QUEUE_MAX_ATTEMPTS", "5"))
+    email_queue_backoff_base: float = float(os.getenv("EMAIL_QUEUE_BACKOFF_BASE", "2"))
+    email_queue_backoff_max: float = float(os.getenv("EMAIL_QUEUE_BACKOFF_MAX", "300"))
+    email_queue_visibility_timeout: float = float(os.getenv("EMAIL_QUEUE_VISIBILITY_TIMEOUT", "60"))
+    email_worker_in_process: bool = os.getenv("EMAIL_WORKER_IN_PROCESS", "true").lower() == "true"
+
+    outbox_batch_size: int = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+    outbox_poll_interval: float = float(os.getenv("OUTBOX_POLL_INTERVAL", "1"))
+    outbox_max_attempts: int = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+    outbox_backoff_base: float = float(os.getenv("OUTBOX_BACKOFF_BASE", "2"))
+    outbox_backoff_max: float = float(os.getenv("OUTBOX_BACKOFF_MAX", "600"))
+    outbox_lease_seconds: float = float(os.getenv("OUTBOX_LEASE_SECONDS", "300"))
+    outbox_relay_in_process: bool = os.getenv("OUTBOX_RELAY_IN_PROCESS", "true").lower() == "true"
+
+    rate_limit_enabled: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    rate_limit_login: str = os.getenv("RATE_LIMIT_LOGIN", "5/minute")
+    rate_limit_password_reset: str = os.getenv("RATE_LIMIT_PASSWORD_RESET", "3/hour")
+
+    password_hash_executor: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+    password_hash_workers: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+    password_hash_max_queue: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+
+    viacep_url: str = os.getenv("VIACEP_URL", "https://viacep.com.br/ws/{cep}/json/")
+    viacep_http2: bool = os.getenv("VIACEP_HTTP2", "true").lower() == "true"
+    viacep_max_connections: int = int(os.getenv("VIACEP_MAX_CONNECTIONS", "20"))
+    viacep_max_keepalive: int = int(os.getenv("VIACEP_MAX_KEEPALIVE", "10"))
+    viacep_keepalive_expiry: float = float(os.getenv("VIACEP_KEEPALIVE_EXPIRY", "30"))
+    viacep_timeout: float = float(os.getenv("VIACEP_TIMEOUT", "5"))
+    viacep_breaker_failure_threshold: int = int(os.getenv("VIACEP_BREAKER_FAILURE_THRESHOLD", "5"))
+    viacep_breaker_recovery_timeout: float = float(os.getenv("VIACEP_BREAKER_RECOVERY_TIMEOUT", "30"))
+    viacep_breaker_half_open_calls: int = int(os.getenv("VIACEP_BREAKER_HALF_OPEN_CALLS", "1"))
+    viacep_hedge_enabled: bool = os.getenv("VIACEP_HEDGE_ENABLED", "false").lower() == "true"
+    viacep_hedge_delay_ms: float = float(os.getenv("VIACEP_HEDGE_DELAY_MS", "0"))
+    viacep_hedge_min_delay_ms: float = float(os.getenv("VIACEP_HEDGE_MIN_DELAY_MS", "50"))
+    cep_database_path: str = os.getenv("CEP_DATABASE_PATH", "")
+    cep_database_mode: str = os.getenv("CEP_DATABASE_MODE", "first")
+    cep_cache_ttl: int = int(os.getenv("CEP_CACHE_TTL", str(30 * 24 * 3600)))
+    cep_negative_cache_ttl: int = int(os.getenv("CEP_NEGATIVE_CACHE_TTL", str(24 * 3600)))
+    cep_local_cache_ttl: int = int(os.getenv("CEP_LOCAL_CACHE_TTL", "3600"))
+
+    smtp_sink_enabled: bool = os.getenv("SMTP_SINK_ENABLED", "false").lower() == "true"
+    smtp_sink_host: str = os.getenv("SMTP_SINK_HOST", "127.0.0.1")
+    smtp_sink_port: int = int(os.getenv("SMTP_SINK_PORT", "8025"))
+    smtp_sink_latency_ms: float = float(os.getenv("SMTP_SINK_LATENCY_MS", "0"))
+    smtp_sink_max_messages: int = int(os.getenv("SMTP_SINK_MAX_MESSAGES", "1000"))
+    viacep_stub_enabled: bool = os.getenv("VIACEP_STUB_ENABLED", "false").lower() == "true"
+    viacep_stub_latency_ms: float = float(os.getenv("VIACEP_STUB_LATENCY_MS", "80"))
+    viacep_stub_jitter_ms: float = float(os.getenv("VIACEP_STUB_JITTER_MS", "30"))
+    viacep_stub_error_rate: float = float(os.getenv("VIACEP_STUB_ERROR_RATE", "0"))
+    viacep_stub_timeout_rate: float = float(os.getenv("VIACEP_STUB_TIMEOUT_RATE", "0"))
+    viacep_stub_not_found_prefix: str = os.getenv("VIACEP_STUB_NOT_FOUND_PREFIX", "99999")
 
     password_reset_expire_hours: int = int(os.getenv("PASSWORD_RESET_EXPIRE_HOURS", "1"))
 
@@ -65,5 +168,19 @@ class Settings(BaseSettings):
                 "e adicione ao arquivo .env"
             )
 
+    def apply_local_stubs(self):
+        if self.environment == "production" and (self.smtp_sink_enabled or self.viacep_stub_enabled):
+            raise ValueError("SMTP_SINK_ENABLED e VIACEP_STUB_ENABLED não podem ser usados em produção")
+
+        if self.smtp_sink_enabled:
+            self.smtp_host = self.smtp_sink_host
+            self.smtp_port = self.smtp_sink_port
+            self.smtp_tls = False
+            self.smtp_ssl = False
+
+        if self.viacep_stub_enabled:
+            self.viacep_url = "http://viacep.stub/ws/{cep}/json/"
+
 settings = Settings()
 settings.validate_settings()
+settings.apply_local_stubs()
@@ -1,24 +1,174 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError, SQLAlchemyError
+from sqlalchemy import event
+from fastapi import Depends
 from app.core.config import settings
+from app.core.cache import RedisCache
+from app.core.security import get_current_user
+from app.core.metrics import db_queries_total
+from typing import Any, Dict, List, Optional
+import asyncio
 import logging
+import time
+import structlog
 
 logging.basicConfig(level=logging.INFO)
 
+logger = structlog.get_logger(__name__)
+
 Base = declarative_base()
 
+
+class PoolMetrics:
+    acquisitions: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    overflow_events: int = 0
+    timeouts: int = 0
+
+    @classmethod
+    def record_wait(cls, seconds: float) -> None:
+        cls.acquisitions += 1
+        cls.wait_seconds_total += seconds
+        if seconds > cls.wait_seconds_max:
+            cls.wait_seconds_max = seconds
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            PoolMetrics.timeouts += 1
+            raise
+        PoolMetrics.record_wait(time.perf_counter() - started)
+        return connection
+
+
 engine = create_async_engine(
     settings.database_url,
-    echo=True,
-    future=True
+    echo=settings.db_echo,
+    future=True,
+    poolclass=InstrumentedAsyncPool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping
 )
 
+
+@event.listens_for(engine.sync_engine.pool, "connect")
+def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+    if engine.sync_engine.pool.overflow() > 0:
+        PoolMetrics.overflow_events += 1
+
+
+def _count_queries(engine_label: str, sync_engine: Any) -> None:
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(*args: Any) -> None:
+        db_queries_total.inc(engine=engine_label)
+
+
+_count_queries("primary", engine.sync_engine)
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    pool = engine.sync_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(0, pool.overflow()),
+        "max_overflow": settings.db_max_overflow,
+        "acquisitions": PoolMetrics.acquisitions,
+        "wait_seconds_total": round(PoolMetrics.wait_seconds_total, 6),
+        "wait_seconds_max": round(PoolMetrics.wait_seconds_max, 6),
+        "overflow_events": PoolMetrics.overflow_events,
+        "timeouts": PoolMetrics.timeouts,
+    }
+
+
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False
 )
 
+replica_engines: List[Any] = [
+    create_async_engine(
+        url,
+        echo=settings.db_echo,
+        future=True,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args={"timeout": settings.replica_connect_timeout}
+    )
+    for url in settings.database_replica_url_list
+]
+
+for replica_engine in replica_engines:
+    _count_queries("replica", replica_engine.sync_engine)
+
+replica_session_makers = [
+    async_sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+    for replica_engine in replica_engines
+]
+
+
+
+class ReplicaPool:
+    _next: int = 0
+    _unhealthy_until: Dict[int, float] = {}
+
+    @classmethod
+    def pick(cls) -> Optional[int]:
+        now = time.monotonic()
+        for _ in range(len(replica_session_makers)):
+            index = cls._next % len(replica_session_makers)
+            cls._next += 1
+            if cls._unhealthy_until.get(index, 0.0) <= now:
+                return index
+        return None
+
+    @classmethod
+    def mark_unhealthy(cls, index: int, error: str) -> None:
+        cls._unhealthy_until[index] = time.monotonic() + settings.replica_unhealthy_backoff
+        logger.warning("replica_unavailable", replica=index, backoff=settings.replica_unhealthy_backoff, error=error)
+
+
+class ReadYourWrites:
+    _local: Dict[int, float] = {}
+
+    @classmethod
+    async def mark(cls, user_id: int) -> None:
+        if not replica_session_makers:
+            return
+
+        ttl = settings.replica_read_your_writes_seconds
+        now = time.monotonic()
+        if len(cls._local) > 10000:
+            cls._local = {uid: expires for uid, expires in cls._local.items() if expires > now}
+        cls._local[user_id] = now + ttl
+        await RedisCache.set(f"ryw:{user_id}", 1, expire=ttl)
+
+    @classmethod
+    async def requires_primary(cls, user_id: int) -> bool:
+        expires = cls._local.get(user_id)
+        if expires is not None:
+            if expires > time.monotonic():
+                return True
+            cls._local.pop(user_id, None)
+        return await RedisCache.get(f"ryw:{user_id}") is not None
+
+
 async def get_db():
     async with async_session_maker() as session:
         try:
@@ -26,8 +176,30 @@ async def get_db():
         finally:
             await session.close()
 
+
+async def get_read_db(current_user: dict = Depends(get_current_user)):
+    index = None
+    if replica_session_makers and not await ReadYourWrites.requires_primary(current_user["user_id"]):
+        index = ReplicaPool.pick()
+
+    if index is None:
+        session = async_session_maker()
+    else:
+        session = replica_session_makers[index]()
+        try:
+            await asyncio.wait_for(session.connection(), timeout=settings.replica_connect_timeout)
+        except (OSError, SQLAlchemyError, asyncio.TimeoutError) as e:
+            # Réplica fora do ar ou pool esgotado: sai do rodízio por um tempo e a leitura vai para o primário
+            ReplicaPool.mark_unhealthy(index, str(e) or type(e).__name__)
+            await session.close()
+            session = async_session_maker()
+
+    try:
+        yield session
+    finally:
+        await session.close()
+
 async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     logging.info("Tabelas criadas com sucesso no PostgreSQL!")
-
@@ -0,0 +1,198 @@
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+import bisect
+import threading
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_registry: List["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(_Metric):
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sums[key] = self._sums.get(key, 0) + value
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(self._sums[key])}")
+        return lines
+
+
+class CallbackMetric(_Metric):
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            metric_type: str,
+            callback: Callable[[], Union[float, Dict[str, float]]],
+            labelname: Optional[str] = None
+    ):
+        super().__init__(name, documentation, (labelname,) if labelname else ())
+        self.metric_type = metric_type
+        self.callback = callback
+
+    def samples(self) -> List[str]:
+        value = self.callback()
+        if isinstance(value, dict):
+            return [
+                f"{self.name}{_format_labels(self.labelnames, (label,))} {_format_value(sample)}"
+                for label, sample in value.items()
+            ]
+        return [f"{self.name} {_format_value(value)}"]
+
+
+def render_metrics() -> str:
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+http_requests_total = Counter(
+    "http_requests_total", "Total de requisições HTTP", ("method", "route", "status")
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "Latência das requisições HTTP", ("method", "route", "status")
+)
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight", "Requisições HTTP em andamento", ("method", "route")
+)
+password_hash_duration_seconds = Histogram(
+    "password_hash_duration_seconds", "Tempo de hashing/verificação bcrypt", ("operation",),
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0)
+)
+fernet_operations_total = Counter(
+    "fernet_operations_total", "Operações de criptografia Fernet", ("operation",)
+)
+db_queries_total = Counter(
+    "db_queries_total", "Consultas SQL executadas", ("engine",)
+)
+circuit_breaker_state = Gauge(
+    "circuit_breaker_state", "Estado do circuit breaker (0=fechado, 1=semiaberto, 2=aberto)", ("name",)
+)
+circuit_breaker_transitions_total = Counter(
+    "circuit_breaker_transitions_total", "Transições de estado do circuit breaker", ("name", "state")
+)
+circuit_breaker_rejections_total = Counter(
+    "circuit_breaker_rejections_total", "Chamadas rejeitadas com o circuito aberto", ("name",)
+)
+viacep_hedged_requests_total = Counter(
+    "viacep_hedged_requests_total", "Requisições hedged ao ViaCEP", ("outcome",)
+)
+email_jobs_total = Counter(
+    "email_jobs_total", "Eventos da fila de e-mails", ("event",)
+)
+outbox_events_total = Counter(
+    "outbox_events_total", "Eventos processados pelo relay do outbox", ("event_type", "outcome")
+)
+session_events_total = Counter(
+    "session_events_total", "Eventos de sessões de refresh token", ("event",)
+)
@@ -0,0 +1,107 @@
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+from fastapi import Request
+from app.core.cache import RedisCache
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.exceptions import RateLimitException
+import math
+import time
+import uuid
+
+logger = get_logger(__name__)
+
+_SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local member = ARGV[3]
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+local count = redis.call('ZCARD', key)
+if count >= limit then
+    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    return {0, tonumber(oldest[2]) + window - now}
+end
+
+redis.call('ZADD', key, now, member)
+redis.call('PEXPIRE', key, window)
+return {1, 0}
+"""
+
+_PERIODS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+}
+
+
+def get_client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimiter:
+    _script = None
+    _script_client = None
+    _local: Dict[str, Deque[float]] = {}
+
+    @staticmethod
+    def parse_limit(limit: str) -> Tuple[int, int]:
+        amount, _, period = limit.partition("/")
+        return int(amount), _PERIODS[period.strip().rstrip("s")]
+
+    @classmethod
+    async def hit(cls, scope: str, identifier: str, limit: str) -> None:
+        if not settings.rate_limit_enabled:
+            return
+
+        max_requests, window_seconds = cls.parse_limit(limit)
+        key = f"ratelimit:{scope}:{identifier}"
+
+        result = await cls._hit_redis(key, max_requests, window_seconds * 1000)
+        if result is None:
+            result = cls._hit_local(key, max_requests, window_seconds)
+
+        allowed, retry_after_ms = result
+        if not allowed:
+            retry_after = max(1, math.ceil(retry_after_ms / 1000))
+            logger.warning("rate_limit_exceeded", scope=scope, limit=limit, retry_after=retry_after)
+            raise RateLimitException(retry_after=retry_after, limit=limit)
+
+    @classmethod
+    async def _hit_redis(cls, key: str, max_requests: int, window_ms: int) -> Optional[Tuple[bool, int]]:
+        try:
+            client = await RedisCache.get_instance()
+            if client is None:
+                return None
+
+            if cls._script is None or cls._script_client is not client:
+                cls._script = client.register_script(_SLIDING_WINDOW_SCRIPT)
+                cls._script_client = client
+
+            allowed, retry_after_ms = await cls._script(
+                keys=[key],
+                args=[window_ms, max_requests, uuid.uuid4().hex]
+            )
+            return bool(allowed), int(retry_after_ms)
+        except Exception as e:
+            logger.warning("rate_limit_redis_unavailable", error=str(e))
+            return None
+
+    @classmethod
+    def _hit_local(cls, key: str, max_requests: int, window_seconds: int) -> Tuple[bool, int]:
+        now = time.monotonic()
+        hits = cls._local.setdefault(key, deque())
+        while hits and hits[0] <= now - window_seconds:
+            hits.popleft()
+
+        if len(hits) >= max_requests:
+            return False, int((hits[0] + window_seconds - now) * 1000)
+
+        hits.append(now)
+        if len(cls._local) > 10000:
+            cls._local = {k: v for k, v in cls._local.items() if v and v[-1] > now - _PERIODS["day"]}
+        return True, 0
@@ -4,6 +4,9 @@ from datetime import datetime, timedelta, timezone
 from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.core.config import settings
+from app.exceptions import ServiceOverloadedException
+from app.core.metrics import password_hash_duration_seconds, fernet_operations_total
+from app.core.timing import span, record_span
 from cryptography.fernet import Fernet, InvalidToken
 import base64
 from cryptography.hazmat.primitives import hashes
@@ -11,6 +14,14 @@ from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import os
 import structlog
 import hashlib
+import hmac
+import re
+import asyncio
+import threading
+import time
+from functools import lru_cache
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
 
 logger = structlog.get_logger(__name__)
 
@@ -19,7 +30,7 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
 
-def _get_cipher():
+def derive_encryption_key() -> bytes:
     encryption_key = os.getenv("ENCRYPTION_KEY")
     if not encryption_key:
         raise ValueError(
@@ -42,15 +53,60 @@ def _get_cipher():
         salt=encryption_salt.encode(),
         iterations=480000,
     )
-    key = base64.urlsafe_b64encode(kdf.derive(encryption_key.encode()))
-    return Fernet(key)
-
-
-try:
-    cipher = _get_cipher()
-except ValueError as e:
-    print(f"ERRO DE CONFIGURAÇÃO: {e}")
-    cipher = None
+    return base64.urlsafe_b64encode(kdf.derive(encryption_key.encode()))
+
+
+class CipherProvider:
+    _cipher: Optional[Fernet] = None
+    _error: Optional[str] = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _load_key() -> Tuple[bytes, str]:
+        derived_key = os.getenv("ENCRYPTION_DERIVED_KEY")
+        if derived_key:
+            return derived_key.strip().encode(), "env"
+
+        key_file = os.getenv("ENCRYPTION_DERIVED_KEY_FILE")
+        if key_file:
+            # Sem fallback para o PBKDF2: um arquivo configurado e ilegível é erro de deploy
+            try:
+                with open(key_file, "rb") as f:
+                    return f.read().strip(), "file"
+            except OSError as e:
+                raise ValueError(f"ENCRYPTION_DERIVED_KEY_FILE não pôde ser lido ({key_file}): {e.strerror}")
+
+        return derive_encryption_key(), "pbkdf2"
+
+    @classmethod
+    def get(cls) -> Optional[Fernet]:
+        if cls._cipher is not None or cls._error is not None:
+            return cls._cipher
+
+        with cls._lock:
+            if cls._cipher is None and cls._error is None:
+                started = time.perf_counter()
+                try:
+                    key, source = cls._load_key()
+                    cls._cipher = Fernet(key)
+                except ValueError as e:
+                    cls._error = str(e)
+                    logger.error("cipher_configuration_error", error=cls._error)
+                    return None
+                logger.info(
+                    "cipher_initialized",
+                    source=source,
+                    duration_ms=round((time.perf_counter() - started) * 1000, 2)
+                )
+
+        return cls._cipher
+
+    @classmethod
+    def require(cls) -> Fernet:
+        cipher = cls.get()
+        if cipher is None:
+            raise ValueError(cls._error)
+        return cipher
 
 
 def hash_password(password: str) -> str:
@@ -71,23 +127,99 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+class PasswordHashPool:
+    _executor: Optional[Executor] = None
+    _pending: int = 0
+    _completed: int = 0
+    _rejected: int = 0
+
+    @classmethod
+    def _get_executor(cls) -> Executor:
+        if cls._executor is None:
+            workers = max(1, settings.password_hash_workers)
+            if settings.password_hash_executor == "process":
+                cls._executor = ProcessPoolExecutor(max_workers=workers)
+            else:
+                cls._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+            logger.info(
+                "password_hash_pool_started",
+                executor=settings.password_hash_executor,
+                workers=workers,
+                max_queue=settings.password_hash_max_queue
+            )
+        return cls._executor
+
+    @classmethod
+    async def run(cls, func: Callable[..., Any], *args: Any) -> Any:
+        capacity = max(1, settings.password_hash_workers) + settings.password_hash_max_queue
+        if cls._pending >= capacity:
+            cls._rejected += 1
+            logger.warning("password_hash_pool_saturated", pending=cls._pending, capacity=capacity)
+            raise ServiceOverloadedException(resource="password_hash", retry_after=1)
+
+        cls._pending += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(cls._get_executor(), func, *args)
+        finally:
+            cls._pending -= 1
+            cls._completed += 1
+            elapsed = time.perf_counter() - started
+            password_hash_duration_seconds.observe(elapsed, operation=func.__name__)
+            record_span("bcrypt", elapsed)
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        workers = max(1, settings.password_hash_workers)
+        return {
+            "workers": workers,
+            "pending": cls._pending,
+            "in_flight": min(cls._pending, workers),
+            "queue_depth": max(0, cls._pending - workers),
+            "completed": cls._completed,
+            "rejected": cls._rejected,
+        }
+
+    @classmethod
+    def shutdown(cls) -> None:
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=True)
+            cls._executor = None
+            logger.info("password_hash_pool_stopped")
+
+
+async def hash_password_async(password: str) -> str:
+    return await PasswordHashPool.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await PasswordHashPool.run(verify_password, plain_password, hashed_password)
+
+
 def encrypt_data(data: str) -> str:
     if not data:
         return data
+    cipher = CipherProvider.get()
     if cipher is None:
         raise ValueError("Cipher não inicializado. Verifique ENCRYPTION_KEY e ENCRYPTION_SALT no .env")
-    encrypted = cipher.encrypt(data.encode())
+    fernet_operations_total.inc(operation="encrypt")
+    with span("crypto"):
+        encrypted = cipher.encrypt(data.encode())
     return encrypted.decode()
 
 
 def decrypt_data(encrypted_data: str) -> str:
     if not encrypted_data:
         return encrypted_data
+    cipher = CipherProvider.get()
     if cipher is None:
         raise ValueError("Cipher não inicializado. Verifique ENCRYPTION_KEY e ENCRYPTION_SALT no .env")
 
+    fernet_operations_total.inc(operation="decrypt")
     try:
-        decrypted = cipher.decrypt(encrypted_data.encode())
+        with span("crypto"):
+            decrypted = cipher.decrypt(encrypted_data.encode())
         return decrypted.decode()
     except InvalidToken:
         logger.error(
@@ -104,6 +236,23 @@ def decrypt_data(encrypted_data: str) -> str:
         raise
 
 
+@lru_cache(maxsize=1)
+def get_blind_index_key() -> bytes:
+    blind_index_key = os.getenv("BLIND_INDEX_KEY")
+    if not blind_index_key:
+        raise ValueError(
+            "BLIND_INDEX_KEY não está definida! "
+            "Execute: openssl rand -hex 32 "
+            "e adicione BLIND_INDEX_KEY ao arquivo .env"
+        )
+    return blind_index_key.encode()
+
+
+def compute_cpf_hash(cpf: str) -> str:
+    cpf_limpo = re.sub(r'\D', '', cpf)
+    return hmac.new(get_blind_index_key(), cpf_limpo.encode(), hashlib.sha256).hexdigest()
+
+
 def hash_sensitive_data(data: str, salt: str = None) -> str:
     if not salt:
         salt = os.getenv("HASH_SALT", "default_salt_change_me")
@@ -123,13 +272,17 @@ def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 
 
-def create_refresh_token(data: dict) -> str:
+def create_refresh_token(data: dict, expires_at: datetime = None) -> str:
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days)
+    expire = expires_at or datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days)
     to_encode.update({"exp": expire, "type": "refresh"})
     return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 
 
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def verify_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
@@ -0,0 +1,158 @@
+import json
+from typing import Any, Dict, Optional, Set, Tuple, Type
+from pydantic import BaseModel
+from app.core.config import settings
+from app.core.logging import get_logger
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+logger = get_logger(__name__)
+
+ENVELOPE_MAGIC = b"W"
+ENVELOPE_VERSION = 1
+
+CODEC_JSON = 1
+CODEC_MSGPACK = 2
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZSTD = 1
+COMPRESSION_LZ4 = 2
+
+
+class SerializationError(Exception):
+    pass
+
+
+class JSONCodec:
+    codec_id = CODEC_JSON
+
+    @staticmethod
+    def dumps(value: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(value)
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    @staticmethod
+    def loads(data: bytes) -> Any:
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+
+class MsgpackCodec:
+    codec_id = CODEC_MSGPACK
+
+    @staticmethod
+    def dumps(value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    @staticmethod
+    def loads(data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+class CacheSerializer:
+    _models: Dict[str, Tuple[Type[BaseModel], int]] = {}
+    _codecs = {CODEC_JSON: JSONCodec, CODEC_MSGPACK: MsgpackCodec}
+    _warned: Set[str] = set()
+
+    @classmethod
+    def register_model(cls, model: Type[BaseModel], version: int = 1) -> Type[BaseModel]:
+        cls._models[model.__name__] = (model, version)
+        return model
+
+    @classmethod
+    def _warn_unavailable(cls, event: str, **fields: str) -> None:
+        # Um aviso por processo: a configuração não muda em tempo de execução
+        if event not in cls._warned:
+            cls._warned.add(event)
+            logger.warning(event, **fields)
+
+    @classmethod
+    def _get_codec(cls):
+        if settings.cache_codec == "msgpack":
+            if msgpack is not None:
+                return MsgpackCodec
+            cls._warn_unavailable("cache_codec_unavailable", codec="msgpack", fallback="json")
+        return JSONCodec
+
+    @classmethod
+    def _compress(cls, payload: bytes) -> Tuple[bytes, int]:
+        if settings.cache_compression == "none" or len(payload) < settings.cache_compression_threshold:
+            return payload, COMPRESSION_NONE
+        if settings.cache_compression == "zstd":
+            if zstandard is not None:
+                return zstandard.ZstdCompressor(level=3).compress(payload), COMPRESSION_ZSTD
+            cls._warn_unavailable("cache_compression_unavailable", compression="zstd", package="zstandard")
+        elif settings.cache_compression == "lz4":
+            if lz4_frame is not None:
+                return lz4_frame.compress(payload), COMPRESSION_LZ4
+            cls._warn_unavailable("cache_compression_unavailable", compression="lz4", package="lz4")
+        return payload, COMPRESSION_NONE
+
+    @staticmethod
+    def _decompress(payload: bytes, compression: int) -> bytes:
+        if compression == COMPRESSION_NONE:
+            return payload
+        if compression == COMPRESSION_ZSTD and zstandard is not None:
+            return zstandard.ZstdDecompressor().decompress(payload)
+        if compression == COMPRESSION_LZ4 and lz4_frame is not None:
+            return lz4_frame.decompress(payload)
+        raise SerializationError(f"Compressão {compression} não suportada neste processo")
+
+    @classmethod
+    def dumps(cls, value: Any) -> bytes:
+        if isinstance(value, BaseModel):
+            registered = cls._models.get(type(value).__name__)
+            if registered is None or registered[0] is not type(value):
+                raise SerializationError(f"Modelo {type(value).__name__} não registrado para cache")
+            body = {"t": type(value).__name__, "v": registered[1], "d": value.model_dump(mode="json")}
+        else:
+            body = {"d": value}
+
+        codec = cls._get_codec()
+        payload, compression = cls._compress(codec.dumps(body))
+        header = ENVELOPE_MAGIC + bytes((ENVELOPE_VERSION, codec.codec_id, compression))
+        return header + payload
+
+    @classmethod
+    def loads(cls, data: bytes) -> Optional[Any]:
+        if len(data) < 4 or data[:1] != ENVELOPE_MAGIC:
+            raise SerializationError("Envelope de cache inválido")
+
+        version, codec_id, compression = data[1], data[2], data[3]
+        if version != ENVELOPE_VERSION:
+            raise SerializationError(f"Versão de envelope {version} não suportada")
+
+        codec = cls._codecs.get(codec_id)
+        if codec is None or (codec is MsgpackCodec and msgpack is None):
+            raise SerializationError(f"Codec {codec_id} não suportado neste processo")
+
+        body = codec.loads(cls._decompress(data[4:], compression))
+        type_name = body.get("t")
+        if type_name is None:
+            return body.get("d")
+
+        registered = cls._models.get(type_name)
+        if registered is None or registered[1] != body.get("v"):
+            raise SerializationError(f"Schema de {type_name} incompatível com a entrada em cache")
+        # Entradas são produzidas a partir de modelos já validados e versionados; evita revalidar (EmailStr é caro)
+        return registered[0].model_construct(**body["d"])
@@ -0,0 +1,84 @@
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import functools
+import time
+
+
+class RequestTimings:
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: Dict[str, List[float]] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        span = self.spans.setdefault(name, [0.0, 0])
+        span[0] += seconds
+        span[1] += 1
+
+    def total_ms(self) -> float:
+        return round((time.perf_counter() - self.started) * 1000, 2)
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {"ms": round(seconds * 1000, 2), "count": count}
+            for name, (seconds, count) in self.spans.items()
+        }
+
+    def server_timing_header(self) -> str:
+        parts = [
+            f'{name};dur={seconds * 1000:.2f};desc="{count}x"'
+            for name, (seconds, count) in self.spans.items()
+        ]
+        parts.append(f"total;dur={self.total_ms():.2f}")
+        return ", ".join(parts)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def start_request_timing() -> Token:
+    return _current.set(RequestTimings())
+
+
+def finish_request_timing(token: Token) -> Optional[RequestTimings]:
+    timings = _current.get()
+    _current.reset(token)
+    return timings
+
+
+def record_span(name: str, seconds: float) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+
+
+def timed(name: str) -> Callable:
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            timings = _current.get()
+            if timings is None:
+                return await func(*args, **kwargs)
+
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                timings.add(name, time.perf_counter() - started)
+        return wrapper
+    return decorator
@@ -5,6 +5,7 @@ from .auth import (
     TokenExpiredException,
     InvalidTokenException,
     RefreshTokenExpiredException,
+    RefreshTokenReusedException,
     UnauthorizedException,
     MissingTokenException
 )
@@ -36,6 +37,7 @@ from .system import (
     ExternalServiceException,
     ViaCEPException,
     RateLimitException,
+    ServiceOverloadedException,
     EncryptionException,
     ConfigurationException
 )
@@ -48,6 +50,7 @@ __all__ = [
     "TokenExpiredException",
     "InvalidTokenException",
     "RefreshTokenExpiredException",
+    "RefreshTokenReusedException",
     "UnauthorizedException",
     "MissingTokenException",
     "NotFoundException",
@@ -71,6 +74,7 @@ __all__ = [
     "ExternalServiceException",
     "ViaCEPException",
     "RateLimitException",
+    "ServiceOverloadedException",
     "EncryptionException",
     "ConfigurationException",
 ]
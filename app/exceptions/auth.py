@@ -57,6 +57,16 @@ class RefreshTokenExpiredException(AuthenticationException):
         self.error_code = "REFRESH_TOKEN_EXPIRED"
 
 
+class RefreshTokenReusedException(AuthenticationException):
+
+    def __init__(self, message: str = "Refresh token já utilizado. Sessão encerrada, faça login novamente"):
+        super().__init__(
+            message=message,
+            details={"hint": "Um refresh token antigo foi reapresentado e a sessão foi revogada por segurança"}
+        )
+        self.error_code = "REFRESH_TOKEN_REUSED"
+
+
 class UnauthorizedException(AppException):
 
     def __init__(
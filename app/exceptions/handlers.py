@@ -21,9 +21,14 @@ async def app_exception_handler(request: Request, exc: AppException) -> JSONResp
         details=exc.details
     )
 
+    headers = None
+    if exc.details.get("retry_after"):
+        headers = {"Retry-After": str(exc.details["retry_after"])}
+
     return JSONResponse(
         status_code=exc.status_code,
-        content=exc.to_dict()
+        content=exc.to_dict(),
+        headers=headers
     )
 
 
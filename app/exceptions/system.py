@@ -72,7 +72,8 @@ class ViaCEPException(ExternalServiceException):
             self,
             cep: str,
             message: str = "Erro ao consultar CEP",
-            original_error: Optional[str] = None
+            original_error: Optional[str] = None,
+            retry_after: Optional[int] = None
     ):
         super().__init__(
             service="ViaCEP",
@@ -80,6 +81,8 @@ class ViaCEPException(ExternalServiceException):
             original_error=original_error
         )
         self.details["cep"] = cep
+        if retry_after:
+            self.details["retry_after"] = retry_after
         self.error_code = "VIACEP_ERROR"
 
 
@@ -105,6 +108,28 @@ class RateLimitException(AppException):
         )
 
 
+class ServiceOverloadedException(AppException):
+
+    def __init__(
+            self,
+            message: str = "Servidor sobrecarregado. Tente novamente em instantes",
+            resource: Optional[str] = None,
+            retry_after: Optional[int] = None
+    ):
+        details = {}
+        if resource:
+            details["resource"] = resource
+        if retry_after:
+            details["retry_after"] = retry_after
+
+        super().__init__(
+            message=message,
+            status_code=503,
+            error_code="SERVICE_OVERLOADED",
+            details=details
+        )
+
+
 class EncryptionException(AppException):
 
     def __init__(
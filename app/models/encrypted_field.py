@@ -0,0 +1,44 @@
+from typing import Any, Optional
+from app.core.security import encrypt_data, decrypt_data
+from app.exceptions import EncryptionException
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class EncryptedField:
+
+    def __init__(self, storage: str):
+        self.storage = storage
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.cache = f"_{name}_plaintext"
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if instance is None:
+            return getattr(owner, self.storage)
+
+        ciphertext = getattr(instance, self.storage)
+        cached = instance.__dict__.get(self.cache)
+        if cached is not None and cached[0] == ciphertext:
+            return cached[1]
+
+        try:
+            plaintext = decrypt_data(ciphertext)
+        except ValueError as e:
+            logger.error(
+                "user_decryption_failed",
+                user_id=getattr(instance, "id", None),
+                field=self.name,
+                error=str(e)
+            )
+            raise EncryptionException(operation="decrypt")
+
+        instance.__dict__[self.cache] = (ciphertext, plaintext)
+        return plaintext
+
+    def __set__(self, instance: Any, value: Optional[str]) -> None:
+        ciphertext = encrypt_data(value) if value else None
+        setattr(instance, self.storage, ciphertext)
+        instance.__dict__[self.cache] = (ciphertext, value or None)
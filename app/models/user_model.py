@@ -1,6 +1,7 @@
 from sqlalchemy import String, Integer, DateTime
 from sqlalchemy.orm import Mapped, mapped_column
 from app.core.database import Base
+from app.models.encrypted_field import EncryptedField
 from datetime import datetime, timezone
 from typing import Optional
 
@@ -10,17 +11,27 @@ class UserModel(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True, autoincrement=True)
     nome: Mapped[str] = mapped_column(String(100), nullable=False)
     sobrenome: Mapped[str] = mapped_column(String(100), nullable=False)
-    cpf: Mapped[str] = mapped_column(String(500), unique=True, nullable=False, index=True)
+    _cpf: Mapped[str] = mapped_column("cpf", String(500), unique=True, nullable=False, index=True)
+    cpf_hash: Mapped[Optional[str]] = mapped_column(String(64), unique=True, nullable=True, index=True)
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
     senha: Mapped[str] = mapped_column(String(255), nullable=False)
 
-    cep: Mapped[str] = mapped_column(String(500), nullable=False)
-    logradouro: Mapped[str] = mapped_column(String(500), nullable=False)
-    numero: Mapped[str] = mapped_column(String(500), nullable=False)
-    complemento: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
-    bairro: Mapped[str] = mapped_column(String(500), nullable=False)
-    cidade: Mapped[str] = mapped_column(String(500), nullable=False)
-    estado: Mapped[str] = mapped_column(String(500), nullable=False)
+    _cep: Mapped[str] = mapped_column("cep", String(500), nullable=False)
+    _logradouro: Mapped[str] = mapped_column("logradouro", String(500), nullable=False)
+    _numero: Mapped[str] = mapped_column("numero", String(500), nullable=False)
+    _complemento: Mapped[Optional[str]] = mapped_column("complemento", String(500), nullable=True)
+    _bairro: Mapped[str] = mapped_column("bairro", String(500), nullable=False)
+    _cidade: Mapped[str] = mapped_column("cidade", String(500), nullable=False)
+    _estado: Mapped[str] = mapped_column("estado", String(500), nullable=False)
+
+    cpf = EncryptedField("_cpf")
+    cep = EncryptedField("_cep")
+    logradouro = EncryptedField("_logradouro")
+    numero = EncryptedField("_numero")
+    complemento = EncryptedField("_complemento")
+    bairro = EncryptedField("_bairro")
+    cidade = EncryptedField("_cidade")
+    estado = EncryptedField("_estado")
 
     refresh_token: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     refresh_token_expires: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -42,4 +53,4 @@ class UserModel(Base):
     last_login: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
     def __repr__(self):
-        return f"<User(id={self.id}, nome={self.nome}, sobrenome={self.sobrenome}, cpf={self.cpf})>"
+        return f"<User(id={self.id}, nome={self.nome}, sobrenome={self.sobrenome})>"
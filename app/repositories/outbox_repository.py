@@ -0,0 +1,68 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, select, update
+from app.models.outbox_model import OutboxEventModel
+from typing import Any, Dict, List
+from datetime import datetime, timedelta, timezone
+from app.core.timing import timed
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class OutboxRepository:
+
+    @staticmethod
+    def add(event_type: str, payload: Dict[str, Any], db: AsyncSession) -> OutboxEventModel:
+        # Sem commit: o evento é gravado no mesmo commit da alteração que o originou
+        event = OutboxEventModel(event_type=event_type, payload=payload)
+        db.add(event)
+        return event
+
+    @staticmethod
+    @timed("db")
+    async def claim_batch(batch_size: int, lease_seconds: float, db: AsyncSession) -> List[OutboxEventModel]:
+        now = datetime.now(timezone.utc)
+        result = await db.execute(
+            select(OutboxEventModel)
+            .where(
+                OutboxEventModel.failed_at.is_(None),
+                OutboxEventModel.available_at <= now
+            )
+            .order_by(OutboxEventModel.available_at, OutboxEventModel.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        events = list(result.scalars().all())
+
+        # O lease é gravado e o lock liberado antes da entrega; se o relay cair, o evento volta após o lease
+        for event in events:
+            event.attempts += 1
+            event.available_at = now + timedelta(seconds=lease_seconds)
+        await db.commit()
+        return events
+
+    @staticmethod
+    @timed("db")
+    async def mark_delivered(event_id: int, db: AsyncSession) -> None:
+        await db.execute(delete(OutboxEventModel).where(OutboxEventModel.id == event_id))
+
+    @staticmethod
+    @timed("db")
+    async def mark_retry(event_id: int, error: str, delay_seconds: float, db: AsyncSession) -> None:
+        await db.execute(
+            update(OutboxEventModel)
+            .where(OutboxEventModel.id == event_id)
+            .values(
+                last_error=error[:2000],
+                available_at=datetime.now(timezone.utc) + timedelta(seconds=delay_seconds)
+            )
+        )
+
+    @staticmethod
+    @timed("db")
+    async def mark_failed(event_id: int, error: str, db: AsyncSession) -> None:
+        await db.execute(
+            update(OutboxEventModel)
+            .where(OutboxEventModel.id == event_id)
+            .values(last_error=error[:2000], failed_at=datetime.now(timezone.utc))
+        )
@@ -0,0 +1,113 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, or_, select, update
+from app.models.session_model import UserSessionModel
+from typing import List, Optional
+from datetime import datetime, timezone
+from app.core.timing import timed
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class SessionRepository:
+
+    @staticmethod
+    def add(session: UserSessionModel, db: AsyncSession) -> UserSessionModel:
+        # Sem commit: a sessão é gravada no mesmo commit do login que a originou
+        db.add(session)
+        return session
+
+    @staticmethod
+    @timed("db")
+    async def find_by_id(session_id: str, db: AsyncSession) -> Optional[UserSessionModel]:
+        result = await db.execute(select(UserSessionModel).where(UserSessionModel.id == session_id))
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    @timed("db")
+    async def find_active_ids(user_id: int, db: AsyncSession) -> List[str]:
+        result = await db.execute(
+            select(UserSessionModel.id).where(
+                UserSessionModel.user_id == user_id,
+                UserSessionModel.revoked_at.is_(None)
+            )
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    @timed("db")
+    async def update_token(
+            session_id: str,
+            expected_generation: int,
+            expected_hash: str,
+            token_hash: str,
+            db: AsyncSession
+    ) -> bool:
+        result = await db.execute(
+            update(UserSessionModel)
+            .where(
+                UserSessionModel.id == session_id,
+                UserSessionModel.generation == expected_generation,
+                UserSessionModel.token_hash == expected_hash,
+                UserSessionModel.revoked_at.is_(None)
+            )
+            .values(
+                token_hash=token_hash,
+                generation=expected_generation + 1,
+                last_used_at=datetime.now(timezone.utc)
+            )
+        )
+        await db.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    @timed("db")
+    async def persist_rotation(session_id: str, generation: int, token_hash: str, db: AsyncSession) -> bool:
+        # Sem commit: o flusher grava um lote de rotações por transação; a geração só avança
+        result = await db.execute(
+            update(UserSessionModel)
+            .where(
+                UserSessionModel.id == session_id,
+                UserSessionModel.generation < generation,
+                UserSessionModel.revoked_at.is_(None)
+            )
+            .values(token_hash=token_hash, generation=generation, last_used_at=datetime.now(timezone.utc))
+        )
+        return result.rowcount > 0
+
+    @staticmethod
+    @timed("db")
+    async def revoke(session_id: str, db: AsyncSession) -> bool:
+        result = await db.execute(
+            update(UserSessionModel)
+            .where(UserSessionModel.id == session_id, UserSessionModel.revoked_at.is_(None))
+            .values(revoked_at=datetime.now(timezone.utc))
+        )
+        await db.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    @timed("db")
+    async def revoke_all_for_user(user_id: int, db: AsyncSession) -> int:
+        result = await db.execute(
+            update(UserSessionModel)
+            .where(UserSessionModel.user_id == user_id, UserSessionModel.revoked_at.is_(None))
+            .values(revoked_at=datetime.now(timezone.utc))
+        )
+        await db.commit()
+        return result.rowcount
+
+    @staticmethod
+    async def purge_stale(before: datetime, db: AsyncSession, batch_size: int = 1000) -> int:
+        total = 0
+        while True:
+            stale_ids = (
+                select(UserSessionModel.id)
+                .where(or_(UserSessionModel.expires_at < before, UserSessionModel.revoked_at < before))
+                .limit(batch_size)
+            )
+            result = await db.execute(delete(UserSessionModel).where(UserSessionModel.id.in_(stale_ids)))
+            await db.commit()
+            total += result.rowcount
+            if result.rowcount < batch_size:
+                return total
@@ -1,103 +1,95 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, Row
+from sqlalchemy.exc import IntegrityError
 from app.models.user_model import UserModel
-from app.core.security import encrypt_data, decrypt_data
-from typing import List, Optional
+from app.core.security import decrypt_data, compute_cpf_hash
+from typing import Any, List, Optional
+from datetime import datetime
+from app.core.timing import timed
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+PUBLIC_COLUMNS = (UserModel.id, UserModel.nome, UserModel.sobrenome, UserModel.email)
+LIMITED_COLUMNS = (UserModel.id, UserModel.nome, UserModel.sobrenome)
 
-class UserRepository:
-
-    @staticmethod
-    def _decrypt_user(user: UserModel) -> Optional[UserModel]:
-        if not user:
-            return user
 
-        try:
-            user.cpf = decrypt_data(user.cpf)
-            user.cep = decrypt_data(user.cep)
-            user.logradouro = decrypt_data(user.logradouro)
-            user.numero = decrypt_data(user.numero)
-            if user.complemento:
-                user.complemento = decrypt_data(user.complemento)
-            user.bairro = decrypt_data(user.bairro)
-            user.cidade = decrypt_data(user.cidade)
-            user.estado = decrypt_data(user.estado)
-            return user
-        except ValueError as e:
-            logger.error(
-                "user_decryption_failed",
-                user_id=user.id,
-                email=user.email,
-                error=str(e)
-            )
-            return None
-
-    @staticmethod
-    def _encrypt_user_data(user: UserModel) -> None:
-        if user.cpf and not user.cpf.startswith('gAAAAA'):
-            user.cpf = encrypt_data(user.cpf)
-        if user.cep and not user.cep.startswith('gAAAAA'):
-            user.cep = encrypt_data(user.cep)
-        if user.logradouro and not user.logradouro.startswith('gAAAAA'):
-            user.logradouro = encrypt_data(user.logradouro)
-        if user.numero and not user.numero.startswith('gAAAAA'):
-            user.numero = encrypt_data(user.numero)
-        if user.complemento and not user.complemento.startswith('gAAAAA'):
-            user.complemento = encrypt_data(user.complemento)
-        if user.bairro and not user.bairro.startswith('gAAAAA'):
-            user.bairro = encrypt_data(user.bairro)
-        if user.cidade and not user.cidade.startswith('gAAAAA'):
-            user.cidade = encrypt_data(user.cidade)
-        if user.estado and not user.estado.startswith('gAAAAA'):
-            user.estado = encrypt_data(user.estado)
+class UserRepository:
 
     @staticmethod
+    @timed("db")
     async def find_by_id(user_id: int, db: AsyncSession) -> Optional[UserModel]:
         result = await db.execute(select(UserModel).where(UserModel.id == user_id))
-        user = result.scalar_one_or_none()
-        return UserRepository._decrypt_user(user)
+        return result.scalar_one_or_none()
 
     @staticmethod
+    @timed("db")
     async def find_by_email(email: str, db: AsyncSession) -> Optional[UserModel]:
         result = await db.execute(select(UserModel).where(UserModel.email == email))
-        user = result.scalar_one_or_none()
-        return UserRepository._decrypt_user(user)
+        return result.scalar_one_or_none()
 
     @staticmethod
-    async def find_by_cpf(cpf: str, db: AsyncSession) -> Optional[UserModel]:
-        """
-        TODO: Implementar hash determinístico para otimizar performance.
-        """
-        result = await db.execute(select(UserModel))
-        all_users = result.scalars().all()
-
-        for user in all_users:
-            decrypted_user = UserRepository._decrypt_user(user)
-            if decrypted_user and decrypted_user.cpf == cpf:
-                return decrypted_user
-
-        return None
+    async def backfill_cpf_hashes(db: AsyncSession, batch_size: int = 500) -> int:
+        total = 0
+        while True:
+            result = await db.execute(
+                select(UserModel.id, UserModel.cpf)
+                .where(UserModel.cpf_hash.is_(None))
+                .order_by(UserModel.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+
+            for user_id, encrypted_cpf in rows:
+                await db.execute(
+                    update(UserModel)
+                    .where(UserModel.id == user_id)
+                    .values(cpf_hash=compute_cpf_hash(decrypt_data(encrypted_cpf)))
+                )
+            await db.commit()
+            total += len(rows)
+            logger.info("cpf_hash_backfill_batch", count=len(rows), total=total)
+
+        return total
 
     @staticmethod
-    async def find_by_nome(nome: str, db: AsyncSession) -> List[UserModel]:
-        result = await db.execute(select(UserModel).where(UserModel.nome == nome))
-        users = result.scalars().all()
-        return [UserRepository._decrypt_user(user) for user in users]
+    @timed("db")
+    async def find_all_public(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Row]:
+        result = await db.execute(
+            select(*PUBLIC_COLUMNS)
+            .order_by(UserModel.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.all())
 
     @staticmethod
-    async def find_all(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[UserModel]:
+    @timed("db")
+    async def find_all_public_after(db: AsyncSession, after_id: int = 0, limit: int = 100) -> List[Row]:
         result = await db.execute(
-            select(UserModel)
-            .offset(skip)
+            select(*PUBLIC_COLUMNS)
+            .where(UserModel.id > after_id)
+            .order_by(UserModel.id)
             .limit(limit)
         )
-        users = result.scalars().all()
-        return [UserRepository._decrypt_user(user) for user in users]
+        return list(result.all())
 
     @staticmethod
+    @timed("db")
+    async def find_public_by_email(email: str, db: AsyncSession) -> Optional[Row]:
+        result = await db.execute(select(*PUBLIC_COLUMNS).where(UserModel.email == email))
+        return result.one_or_none()
+
+    @staticmethod
+    @timed("db")
+    async def find_limited_by_nome(nome: str, db: AsyncSession) -> List[Row]:
+        result = await db.execute(select(*LIMITED_COLUMNS).where(UserModel.nome == nome))
+        return list(result.all())
+
+    @staticmethod
+    @timed("db")
     async def create(
         nome: str,
         sobrenome: str,
@@ -116,30 +108,96 @@ class UserRepository:
         db_user = UserModel(
             nome=nome,
             sobrenome=sobrenome,
-            cpf=encrypt_data(cpf),
+            cpf=cpf,
+            cpf_hash=compute_cpf_hash(cpf),
             email=email,
             senha=senha_hash,
-            cep=encrypt_data(cep),
-            logradouro=encrypt_data(logradouro),
-            numero=encrypt_data(numero),
-            complemento=encrypt_data(complemento) if complemento else None,
-            bairro=encrypt_data(bairro),
-            cidade=encrypt_data(cidade),
-            estado=encrypt_data(estado)
+            cep=cep,
+            logradouro=logradouro,
+            numero=numero,
+            complemento=complemento,
+            bairro=bairro,
+            cidade=cidade,
+            estado=estado
         )
         db.add(db_user)
-        await db.commit()
-        await db.refresh(db_user)
-        return UserRepository._decrypt_user(db_user)
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise
+        return db_user
 
     @staticmethod
-    async def update(user: UserModel, db: AsyncSession) -> UserModel:
-        UserRepository._encrypt_user_data(user)
+    def conflicting_field(error: IntegrityError) -> Optional[str]:
+        message = str(error.orig)
+        if "cpf_hash" in message:
+            return "cpf"
+        if "email" in message:
+            return "email"
+        return None
+
+    @staticmethod
+    @timed("db")
+    async def _update_columns(user_id: int, db: AsyncSession, **values: Any) -> bool:
+        result = await db.execute(
+            update(UserModel)
+            .where(UserModel.id == user_id)
+            .values(**values)
+        )
         await db.commit()
-        await db.refresh(user)
-        return UserRepository._decrypt_user(user)
+        return result.rowcount > 0
+
+    @staticmethod
+    async def update_login(user_id: int, last_login: datetime, db: AsyncSession) -> bool:
+        return await UserRepository._update_columns(user_id, db, last_login=last_login)
+
+    @staticmethod
+    async def update_refresh_token(
+        user_id: int,
+        refresh_token: Optional[str],
+        refresh_token_expires: Optional[datetime],
+        db: AsyncSession
+    ) -> bool:
+        return await UserRepository._update_columns(
+            user_id,
+            db,
+            refresh_token=refresh_token,
+            refresh_token_expires=refresh_token_expires
+        )
+
+    @staticmethod
+    async def update_password_reset_token(
+        user_id: int,
+        password_reset_token: Optional[str],
+        password_reset_expires: Optional[datetime],
+        db: AsyncSession
+    ) -> bool:
+        return await UserRepository._update_columns(
+            user_id,
+            db,
+            password_reset_token=password_reset_token,
+            password_reset_expires=password_reset_expires
+        )
+
+    @staticmethod
+    async def update_password_after_reset(user_id: int, senha_hash: str, db: AsyncSession) -> bool:
+        return await UserRepository._update_columns(
+            user_id,
+            db,
+            senha=senha_hash,
+            password_reset_token=None,
+            password_reset_expires=None,
+            refresh_token=None,
+            refresh_token_expires=None
+        )
+
+    @staticmethod
+    async def update_credentials(user_id: int, email: str, senha_hash: str, db: AsyncSession) -> bool:
+        return await UserRepository._update_columns(user_id, db, email=email, senha=senha_hash)
 
     @staticmethod
+    @timed("db")
     async def delete(user: UserModel, db: AsyncSession) -> None:
         await db.delete(user)
         await db.commit()
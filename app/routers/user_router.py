@@ -1,23 +1,22 @@
-from fastapi import APIRouter, Depends, Request
-from typing import List
+from fastapi import APIRouter, Depends, Request, Response
+from typing import List, Optional
 from app.schemas.user_schema import (
     User, UserResponse, UserResponsePublic, UserResponseLimited,
     PasswordResetRequest, PasswordResetConfirm
 )
 from app.controllers.user_controller import UserController
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.security import get_current_user
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, EmailStr, Field
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from app.core.config import settings
+from app.core.rate_limit import RateLimiter, get_client_ip
 from app.exceptions import ValidationException
+from app.utils.pagination import encode_cursor, decode_cursor
 import re
 
 router = APIRouter(prefix="/users", tags=["users"])
 
-limiter = Limiter(key_func=get_remote_address)
-
 class LoginRequest(BaseModel):
     email: EmailStr = Field(..., description="E-mail do usuário")
     senha: str = Field(..., min_length=8, max_length=48, description="Senha do usuário")
@@ -30,8 +29,9 @@ class UpdateUserRequest(BaseModel):
     senha: str = Field(..., min_length=8, max_length=48, description="Nova senha do usuário")
 
 @router.post("/login", response_model=None)
-@limiter.limit("5/minute")
 async def login(request: Request, login_data: LoginRequest, db: AsyncSession = Depends(get_db)):
+    await RateLimiter.hit("login:ip", get_client_ip(request), settings.rate_limit_login)
+    await RateLimiter.hit("login:user", login_data.email.lower(), settings.rate_limit_login)
     return await UserController.login(login_data.email, login_data.senha, db)
 
 @router.post("/refresh", response_model=None)
@@ -43,7 +43,7 @@ async def logout(
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    return await UserController.logout(current_user['user_id'], db)
+    return await UserController.logout(current_user['user_id'], current_user.get('sid'), db)
 
 @router.post("/", status_code=201, response_model=UserResponse)
 async def register_user(user: User, db: AsyncSession = Depends(get_db)):
@@ -51,10 +51,12 @@ async def register_user(user: User, db: AsyncSession = Depends(get_db)):
 
 @router.get("/", response_model=List[UserResponsePublic])
 async def get_users(
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(get_current_user),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ):
     if limit > 100:
         raise ValidationException(
@@ -68,11 +70,33 @@ async def get_users(
             field="skip",
             details={"provided": skip}
         )
-    return await UserController.get_all_users_public(db, skip=skip, limit=limit)
+
+    if cursor is not None:
+        if skip:
+            raise ValidationException(
+                message="Use skip ou cursor, não ambos",
+                field="cursor",
+                details={"skip": skip}
+            )
+        after_id = decode_cursor(cursor)
+        if after_id is None:
+            raise ValidationException(
+                message="Cursor inválido",
+                field="cursor",
+                details={"provided": cursor}
+            )
+        users, next_cursor = await UserController.get_users_page_public(db, after_id=after_id, limit=limit)
+    else:
+        users = await UserController.get_all_users_public(db, skip=skip, limit=limit)
+        next_cursor = encode_cursor(users[-1].id) if users and len(users) == limit else None
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return users
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_data(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     return await UserController.get_user_by_id(current_user['user_id'], db)
@@ -80,7 +104,7 @@ async def get_current_user_data(
 @router.get("/get/nome/{nome}", response_model=List[UserResponseLimited])
 async def get_users_by_nome(
     nome: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     if not re.match(r'^[A-Za-zÀ-ÿ\s]+$', nome):
@@ -100,7 +124,7 @@ async def get_users_by_nome(
 @router.get("/get/email/{email}", response_model=UserResponsePublic)
 async def get_user_by_email_route(
     email: EmailStr,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     return await UserController.get_user_by_email_public(email, db)
@@ -123,12 +147,13 @@ async def update_user_route(
     return await UserController.update_user(user_id, update_data.email, update_data.senha, db, current_user['user_id'])
 
 @router.post("/password-reset/request", response_model=None)
-@limiter.limit("3/hour")
 async def request_password_reset(
     request: Request,
     reset_request: PasswordResetRequest,
     db: AsyncSession = Depends(get_db)
 ):
+    await RateLimiter.hit("password_reset:ip", get_client_ip(request), settings.rate_limit_password_reset)
+    await RateLimiter.hit("password_reset:user", reset_request.email.lower(), settings.rate_limit_password_reset)
     return await UserController.request_password_reset(reset_request.email, db)
 
 @router.post("/password-reset/confirm", response_model=None)
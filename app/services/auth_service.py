@@ -1,7 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from app.repositories.user_repository import UserRepository
-from app.core.security import verify_password, create_access_token, create_refresh_token, verify_refresh_token, \
-    hash_password
+from app.core.security import verify_password_async, verify_refresh_token, hash_password_async
 from app.schemas.user_schema import UserResponse
 from app.core.logging import get_logger
 from datetime import datetime, timezone, timedelta
@@ -11,12 +11,17 @@ from app.exceptions import (
     UserNotFoundException,
     InvalidTokenException,
     RefreshTokenExpiredException,
+    RefreshTokenReusedException,
     PasswordResetTokenExpiredException,
     InvalidPasswordResetTokenException,
     EncryptionException,
-    DatabaseException
+    DatabaseException,
+    ServiceOverloadedException
 )
-from app.services.email_service import EmailService
+from app.repositories.outbox_repository import OutboxRepository
+from app.services.outbox_relay import OutboxRelay
+from app.services.session_service import SessionService
+from fastapi import HTTPException
 import traceback
 import secrets
 
@@ -34,21 +39,11 @@ class AuthService:
                 logger.warning("login_failed", email=email, reason="user_not_found")
                 raise InvalidCredentialsException()
 
-            if not verify_password(senha, user.senha):
+            if not await verify_password_async(senha, user.senha):
                 logger.warning("login_failed", email=email, reason="invalid_password")
                 raise InvalidCredentialsException()
 
-            user.last_login = datetime.now(timezone.utc)
-
-            token_data = {"user_id": user.id, "email": user.email}
-            access_token = create_access_token(token_data)
-            refresh_token = create_refresh_token(token_data)
-
-            refresh_token_expires = datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days)
-            user.refresh_token = refresh_token
-            user.refresh_token_expires = refresh_token_expires
-
-            await UserRepository.update(user, db)
+            tokens = await SessionService.create(user.id, user.email, db, last_login=datetime.now(timezone.utc))
 
             try:
                 user_response = UserResponse(
@@ -74,14 +69,9 @@ class AuthService:
 
             logger.info("login_success", user_id=user.id, email=email)
 
-            return {
-                "user": user_response,
-                "access_token": access_token,
-                "refresh_token": refresh_token,
-                "token_type": "bearer"
-            }
+            return {"user": user_response, **tokens}
 
-        except (InvalidCredentialsException, EncryptionException):
+        except (InvalidCredentialsException, EncryptionException, ServiceOverloadedException):
             raise
         except Exception as e:
             logger.error("authentication_error", error=str(e), traceback=traceback.format_exc())
@@ -97,6 +87,12 @@ class AuthService:
             payload = verify_refresh_token(refresh_token)
             user_id = payload.get("user_id")
 
+            if payload.get("sid"):
+                tokens = await SessionService.refresh(payload, refresh_token, db)
+                logger.info("token_refreshed", user_id=user_id, session_id=payload["sid"])
+                return tokens
+
+            # Refresh tokens emitidos antes das sessões: valida pela coluna legada e migra para uma sessão
             user = await UserRepository.find_by_id(user_id, db)
             if not user:
                 logger.warning("refresh_failed", user_id=user_id, reason="user_not_found")
@@ -110,17 +106,19 @@ class AuthService:
                 logger.warning("refresh_failed", user_id=user_id, reason="token_expired")
                 raise RefreshTokenExpiredException()
 
-            token_data = {"user_id": user.id, "email": user.email}
-            new_access_token = create_access_token(token_data)
+            await UserRepository.update_refresh_token(user.id, None, None, db)
+            tokens = await SessionService.create(user.id, user.email, db)
 
-            logger.info("token_refreshed", user_id=user_id)
+            logger.info("token_refreshed", user_id=user_id, legacy=True)
+            return tokens
 
-            return {
-                "access_token": new_access_token,
-                "token_type": "bearer"
-            }
-
-        except (UserNotFoundException, InvalidTokenException, RefreshTokenExpiredException):
+        except (
+            HTTPException,
+            UserNotFoundException,
+            InvalidTokenException,
+            RefreshTokenExpiredException,
+            RefreshTokenReusedException
+        ):
             raise
         except Exception as e:
             logger.error("refresh_token_error", error=str(e))
@@ -131,17 +129,17 @@ class AuthService:
             )
 
     @staticmethod
-    async def logout(user_id: int, db: AsyncSession) -> dict:
+    async def logout(user_id: int, session_id: Optional[str], db: AsyncSession) -> dict:
         try:
-            user = await UserRepository.find_by_id(user_id, db)
-            if not user:
-                raise UserNotFoundException(user_id=user_id)
-
-            user.refresh_token = None
-            user.refresh_token_expires = None
-            await UserRepository.update(user, db)
+            if session_id:
+                await SessionService.revoke(session_id, user_id, db)
+            else:
+                updated = await UserRepository.update_refresh_token(user_id, None, None, db)
+                if not updated:
+                    raise UserNotFoundException(user_id=user_id)
+                await SessionService.revoke_all(user_id, db)
 
-            logger.info("logout_success", user_id=user_id)
+            logger.info("logout_success", user_id=user_id, session_id=session_id)
 
             return {"detail": "Logout realizado com sucesso."}
 
@@ -169,24 +167,25 @@ class AuthService:
             reset_token = secrets.token_urlsafe(32)
 
             expiration_hours = settings.password_reset_expire_hours
-            user.password_reset_token = reset_token
-            user.password_reset_expires = datetime.now(timezone.utc) + timedelta(hours=expiration_hours)
-
-            await UserRepository.update(user, db)
-
-            logger.info("password_reset_token_generated", user_id=user.id, email=email)
-
-            email_sent = await EmailService.send_password_reset_email(
-                to_email=user.email,
-                user_name=user.nome,
-                reset_token=reset_token,
-                expiration_hours=expiration_hours
+            # O evento entra na sessão antes do UPDATE e é gravado no mesmo commit
+            OutboxRepository.add("email", {
+                "kind": "password_reset",
+                "params": {
+                    "to_email": user.email,
+                    "user_name": user.nome,
+                    "reset_token": reset_token,
+                    "expiration_hours": expiration_hours
+                }
+            }, db)
+            await UserRepository.update_password_reset_token(
+                user.id,
+                reset_token,
+                datetime.now(timezone.utc) + timedelta(hours=expiration_hours),
+                db
             )
+            OutboxRelay.notify()
 
-            if email_sent:
-                logger.info("password_reset_email_sent", user_id=user.id, email=email)
-            else:
-                logger.error("password_reset_email_failed", user_id=user.id, email=email)
+            logger.info("password_reset_token_generated", user_id=user.id, email=email)
 
             return {"detail": success_message}
 
@@ -217,34 +216,26 @@ class AuthService:
                 logger.warning("password_reset_failed", user_id=user.id, reason="token_expired")
                 raise PasswordResetTokenExpiredException()
 
-            user.senha = hash_password(new_password)
-            user.password_reset_token = None
-            user.password_reset_expires = None
-
-            user.refresh_token = None
-            user.refresh_token_expires = None
-
-            await UserRepository.update(user, db)
+            senha_hash = await hash_password_async(new_password)
+            OutboxRepository.add("email", {
+                "kind": "password_changed",
+                "params": {
+                    "to_email": user.email,
+                    "user_name": user.nome,
+                    "change_date": datetime.now(timezone.utc).strftime("%d/%m/%Y às %H:%M")
+                }
+            }, db)
+            await UserRepository.update_password_after_reset(user.id, senha_hash, db)
+            OutboxRelay.notify()
+            await SessionService.revoke_all(user.id, db)
 
             logger.info("password_reset_success", user_id=user.id)
 
-            change_date = datetime.now(timezone.utc).strftime("%d/%m/%Y às %H:%M")
-            email_sent = await EmailService.send_password_changed_email(
-                to_email=user.email,
-                user_name=user.nome,
-                change_date=change_date
-            )
-
-            if email_sent:
-                logger.info("password_changed_email_sent", user_id=user.id)
-            else:
-                logger.error("password_changed_email_failed", user_id=user.id)
-
             return {
                 "detail": "Senha resetada com sucesso. Faça login com sua nova senha."
             }
 
-        except (InvalidPasswordResetTokenException, PasswordResetTokenExpiredException):
+        except (InvalidPasswordResetTokenException, PasswordResetTokenExpiredException, ServiceOverloadedException):
             raise
         except Exception as e:
             logger.error("password_reset_error", error=str(e), traceback=traceback.format_exc())
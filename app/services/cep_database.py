@@ -0,0 +1,119 @@
+import mmap
+import os
+import struct
+from typing import Any, Dict, Iterable, Optional
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+MAGIC = b"WBCEPDB1"
+HEADER = struct.Struct("<8sI")
+PREFIX_SLOTS = 1000
+PREFIX_TABLE = struct.Struct(f"<{PREFIX_SLOTS + 1}I")
+ENTRY = struct.Struct("<IIH")
+FIELDS = ("logradouro", "complemento", "bairro", "localidade", "uf", "ibge", "ddd")
+SEPARATOR = "\x1f"
+
+
+def build_cep_database(records: Iterable[Dict[str, Any]], path: str) -> int:
+    entries = {}
+    for record in records:
+        cep = str(record.get("cep", "")).replace("-", "").replace(".", "").strip()
+        if len(cep) != 8 or not cep.isdigit():
+            continue
+        payload = SEPARATOR.join(str(record.get(field) or "").replace(SEPARATOR, " ") for field in FIELDS)
+        entries[int(cep)] = payload.encode("utf-8")
+
+    ceps = sorted(entries)
+    prefix_table = [0] * (PREFIX_SLOTS + 1)
+    for cep in ceps:
+        prefix_table[cep // 100000 + 1] += 1
+    for slot in range(1, PREFIX_SLOTS + 1):
+        prefix_table[slot] += prefix_table[slot - 1]
+
+    data_start = HEADER.size + PREFIX_TABLE.size + ENTRY.size * len(ceps)
+    index = bytearray()
+    data = bytearray()
+    for cep in ceps:
+        payload = entries[cep]
+        index += ENTRY.pack(cep, data_start + len(data), len(payload))
+        data += payload
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(ceps)))
+        f.write(PREFIX_TABLE.pack(*prefix_table))
+        f.write(index)
+        f.write(data)
+    os.replace(tmp_path, path)
+    return len(ceps)
+
+
+class LocalCEPDatabase:
+    _file = None
+    _mmap: Optional[mmap.mmap] = None
+    _prefix_table: tuple = ()
+    _count: int = 0
+    _missing_path: Optional[str] = None
+
+    @classmethod
+    def open(cls, path: str) -> bool:
+        if cls._mmap is not None:
+            return True
+        if path == cls._missing_path:
+            return False
+        if not path or not os.path.exists(path):
+            logger.warning("cep_database_not_found", path=path)
+            cls._missing_path = path
+            return False
+
+        cls._file = open(path, "rb")
+        cls._mmap = mmap.mmap(cls._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, cls._count = HEADER.unpack_from(cls._mmap, 0)
+        if magic != MAGIC:
+            cls.close()
+            raise ValueError(f"Arquivo de CEPs inválido: {path}")
+
+        cls._prefix_table = PREFIX_TABLE.unpack_from(cls._mmap, HEADER.size)
+        logger.info("cep_database_opened", path=path, records=cls._count)
+        return True
+
+    @classmethod
+    def is_open(cls) -> bool:
+        return cls._mmap is not None
+
+    @classmethod
+    def lookup(cls, cep: str) -> Optional[Dict[str, str]]:
+        if cls._mmap is None:
+            return None
+
+        target = int(cep)
+        prefix = target // 100000
+        lo, hi = cls._prefix_table[prefix], cls._prefix_table[prefix + 1]
+        index_start = HEADER.size + PREFIX_TABLE.size
+
+        while lo < hi:
+            mid = (lo + hi) // 2
+            current, offset, length = ENTRY.unpack_from(cls._mmap, index_start + mid * ENTRY.size)
+            if current < target:
+                lo = mid + 1
+            elif current > target:
+                hi = mid
+            else:
+                values = cls._mmap[offset:offset + length].decode("utf-8").split(SEPARATOR)
+                record = {"cep": f"{cep[:5]}-{cep[5:]}"}
+                record.update(zip(FIELDS, values))
+                return record
+
+        return None
+
+    @classmethod
+    def close(cls) -> None:
+        if cls._mmap is not None:
+            cls._mmap.close()
+            cls._mmap = None
+        if cls._file is not None:
+            cls._file.close()
+            cls._file = None
+        cls._prefix_table = ()
+        cls._count = 0
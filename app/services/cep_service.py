@@ -1,12 +1,142 @@
+import asyncio
 import httpx
-from typing import Optional, Dict, Any
+import math
+import time
+from collections import deque
+from typing import Optional, Dict, Any, Deque
+from app.core.cache import TieredCache
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import viacep_hedged_requests_total
 from app.exceptions import ViaCEPException, InvalidCEPException
+from app.services.cep_database import LocalCEPDatabase
+
+try:
+    import h2
+except ImportError:
+    h2 = None
 
 logger = get_logger(__name__)
 
-VIACEP_URL = "https://viacep.com.br/ws/{cep}/json/"
-TIMEOUT = 5.0
+VIACEP_URL = settings.viacep_url
+TIMEOUT = settings.viacep_timeout
+HEDGE_MIN_SAMPLES = 20
+
+viacep_breaker = CircuitBreaker(
+    "viacep",
+    failure_threshold=settings.viacep_breaker_failure_threshold,
+    recovery_timeout=settings.viacep_breaker_recovery_timeout,
+    half_open_max_calls=settings.viacep_breaker_half_open_calls
+)
+
+
+class ViaCEPClient:
+    _client: Optional[httpx.AsyncClient] = None
+    _latencies: Deque[float] = deque(maxlen=200)
+
+    @classmethod
+    def get_client(cls) -> httpx.AsyncClient:
+        if cls._client is None:
+            transport = None
+            if settings.viacep_stub_enabled:
+                from app.stubs.viacep_stub import TimeoutASGITransport, create_viacep_stub
+                transport = TimeoutASGITransport(app=create_viacep_stub())
+                logger.warning("viacep_stub_enabled", latency_ms=settings.viacep_stub_latency_ms)
+
+            cls._client = httpx.AsyncClient(
+                timeout=TIMEOUT,
+                http2=settings.viacep_http2 and h2 is not None,
+                limits=httpx.Limits(
+                    max_connections=settings.viacep_max_connections,
+                    max_keepalive_connections=settings.viacep_max_keepalive,
+                    keepalive_expiry=settings.viacep_keepalive_expiry
+                ),
+                transport=transport
+            )
+            logger.info("viacep_client_started", http2=settings.viacep_http2 and h2 is not None)
+        return cls._client
+
+    @classmethod
+    async def close(cls) -> None:
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+            logger.info("viacep_client_closed")
+
+    @classmethod
+    def hedge_delay(cls) -> Optional[float]:
+        if not settings.viacep_hedge_enabled:
+            return None
+        if settings.viacep_hedge_delay_ms > 0:
+            return settings.viacep_hedge_delay_ms / 1000
+        if len(cls._latencies) < HEDGE_MIN_SAMPLES:
+            return None
+
+        samples = sorted(cls._latencies)
+        p95 = samples[int(0.95 * (len(samples) - 1))]
+        return max(p95, settings.viacep_hedge_min_delay_ms / 1000)
+
+    @classmethod
+    async def _get(cls, url: str) -> httpx.Response:
+        started = time.perf_counter()
+        response = await cls.get_client().get(url)
+        response.raise_for_status()
+        cls._latencies.append(time.perf_counter() - started)
+        return response
+
+    @classmethod
+    async def _hedged_get(cls, url: str) -> httpx.Response:
+        delay = cls.hedge_delay()
+        if delay is None:
+            return await cls._get(url)
+
+        primary = asyncio.create_task(cls._get(url))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return primary.result()
+
+            viacep_hedged_requests_total.inc(outcome="launched")
+            hedge = asyncio.create_task(cls._get(url))
+            tasks.add(hedge)
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            viacep_hedged_requests_total.inc(outcome="won")
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    @classmethod
+    async def fetch(cls, url: str) -> httpx.Response:
+        viacep_breaker.before_call()
+        try:
+            response = await cls._hedged_get(url)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code >= 500:
+                viacep_breaker.record_failure()
+            else:
+                viacep_breaker.record_success()
+            raise
+        except asyncio.CancelledError:
+            viacep_breaker.release()
+            raise
+        except Exception:
+            viacep_breaker.record_failure()
+            raise
+
+        viacep_breaker.record_success()
+        return response
 
 
 async def consultar_cep(cep: str) -> Optional[Dict[str, Any]]:
@@ -15,23 +145,61 @@ async def consultar_cep(cep: str) -> Optional[Dict[str, Any]]:
     if len(cep_limpo) != 8 or not cep_limpo.isdigit():
         raise InvalidCEPException(message="CEP deve conter exatamente 8 dígitos")
 
+    if settings.cep_database_path and (LocalCEPDatabase.is_open() or LocalCEPDatabase.open(settings.cep_database_path)):
+        record = LocalCEPDatabase.lookup(cep_limpo)
+        if record is not None:
+            logger.debug("cep_database_hit", cep=cep_limpo)
+            return record
+        if settings.cep_database_mode == "only":
+            logger.warning("cep_database_miss", cep=cep_limpo)
+            raise InvalidCEPException(message=f"CEP {cep_limpo} não encontrado")
+
+    cache_key = f"cep:{cep_limpo}"
+    cached = await TieredCache.get(cache_key, local_ttl=settings.cep_local_cache_ttl)
+    if cached is not None:
+        if cached.get('erro'):
+            logger.info("viacep_cache_hit", cep=cep_limpo, found=False)
+            raise InvalidCEPException(message=f"CEP {cep_limpo} não encontrado")
+        logger.info("viacep_cache_hit", cep=cep_limpo, found=True)
+        return cached
+
     url = VIACEP_URL.format(cep=cep_limpo)
 
     try:
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-            logger.info("viacep_request", cep=cep_limpo)
-            response = await client.get(url)
-            response.raise_for_status()
-
-            data = response.json()
-
-            if data.get('erro'):
-                logger.warning("viacep_cep_not_found", cep=cep_limpo)
-                raise InvalidCEPException(message=f"CEP {cep_limpo} não encontrado")
-
-            logger.info("viacep_success", cep=cep_limpo, cidade=data.get('localidade'))
-            return data
+        logger.info("viacep_request", cep=cep_limpo)
+        response = await ViaCEPClient.fetch(url)
+
+        data = response.json()
+
+        if data.get('erro'):
+            logger.warning("viacep_cep_not_found", cep=cep_limpo)
+            await TieredCache.set(
+                cache_key,
+                {"erro": True},
+                expire=settings.cep_negative_cache_ttl,
+                local_ttl=settings.cep_local_cache_ttl
+            )
+            raise InvalidCEPException(message=f"CEP {cep_limpo} não encontrado")
+
+        await TieredCache.set(
+            cache_key,
+            data,
+            expire=settings.cep_cache_ttl,
+            local_ttl=settings.cep_local_cache_ttl
+        )
+        logger.info("viacep_success", cep=cep_limpo, cidade=data.get('localidade'))
+        return data
 
+    except InvalidCEPException:
+        raise
+    except CircuitOpenError as e:
+        logger.warning("viacep_circuit_open", cep=cep_limpo, retry_after=round(e.retry_after, 1))
+        raise ViaCEPException(
+            cep=cep_limpo,
+            message="Serviço de CEP temporariamente indisponível. Tente novamente em instantes.",
+            original_error="Circuit open",
+            retry_after=max(1, math.ceil(e.retry_after))
+        )
     except httpx.TimeoutException:
         logger.error("viacep_timeout", cep=cep_limpo)
         raise ViaCEPException(
@@ -67,4 +235,3 @@ def formatar_cep(cep: str) -> str:
         return f"{cep_limpo[:5]}-{cep_limpo[5:]}"
 
     return cep
-
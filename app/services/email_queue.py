@@ -0,0 +1,225 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from redis.exceptions import ResponseError
+from app.core.cache import RedisCache
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import email_jobs_total
+from app.core.serialization import JSONCodec
+from app.services.email_service import EmailService
+import asyncio
+import os
+import random
+import socket
+import time
+import uuid
+
+logger = get_logger(__name__)
+
+_PROMOTE_DUE_SCRIPT = """
+local jobs = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, job in ipairs(jobs) do
+    redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[3], '*', 'job', job)
+    redis.call('ZREM', KEYS[1], job)
+end
+return #jobs
+"""
+
+EMAIL_JOBS: Dict[str, Callable[..., Awaitable[bool]]] = {
+    "password_reset": EmailService.send_password_reset_email,
+    "password_changed": EmailService.send_password_changed_email,
+}
+
+# Parâmetros que não podem ficar guardados no stream de jobs mortos
+SENSITIVE_PARAMS = ("reset_token",)
+
+
+def redact_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    params = {
+        name: "[REDACTED]" if name in SENSITIVE_PARAMS else value
+        for name, value in job.get("params", {}).items()
+    }
+    return {**job, "params": params}
+
+
+def backoff_delay(attempts: int) -> float:
+    delay = min(settings.email_queue_backoff_max, settings.email_queue_backoff_base * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+class EmailQueue:
+
+    @staticmethod
+    def new_job(kind: str, params: Dict[str, Any], job_id: Optional[str] = None) -> Dict[str, Any]:
+        if kind not in EMAIL_JOBS:
+            raise ValueError(f"Tipo de e-mail desconhecido: {kind}")
+        return {"id": job_id or uuid.uuid4().hex, "kind": kind, "params": params, "attempts": 0}
+
+    @staticmethod
+    async def publish(job: Dict[str, Any]) -> bool:
+        client = await RedisCache.get_instance()
+        if client is None:
+            return False
+
+        await client.xadd(
+            settings.email_queue_stream,
+            {"job": JSONCodec.dumps(job)},
+            maxlen=settings.email_queue_maxlen,
+            approximate=True
+        )
+        email_jobs_total.inc(event="enqueued")
+        logger.info("email_job_enqueued", job_id=job["id"], kind=job["kind"])
+        return True
+
+    @staticmethod
+    async def dispatch(job: Dict[str, Any]) -> bool:
+        handler = EMAIL_JOBS.get(job.get("kind"))
+        if handler is None:
+            logger.error("email_job_unknown_kind", job_id=job.get("id"), kind=job.get("kind"))
+            return False
+        return await handler(**job.get("params", {}))
+
+
+class EmailWorker:
+    consumer: str = f"{socket.gethostname()}-{os.getpid()}"
+    _task: Optional[asyncio.Task] = None
+    _running: bool = False
+    _group_ready: bool = False
+    _last_claim: float = 0.0
+
+    @classmethod
+    async def _ensure_group(cls, client) -> None:
+        if cls._group_ready:
+            return
+        try:
+            await client.xgroup_create(settings.email_queue_stream, settings.email_queue_group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        cls._group_ready = True
+
+    @classmethod
+    async def _promote_due(cls, client) -> int:
+        return await client.eval(
+            _PROMOTE_DUE_SCRIPT,
+            2,
+            settings.email_queue_delayed_key,
+            settings.email_queue_stream,
+            time.time(),
+            settings.email_queue_batch_size,
+            settings.email_queue_maxlen
+        )
+
+    @classmethod
+    async def _claim_stale(cls, client) -> List[Tuple[bytes, Dict[bytes, bytes]]]:
+        now = time.monotonic()
+        if now - cls._last_claim < settings.email_queue_visibility_timeout / 2:
+            return []
+        cls._last_claim = now
+
+        result = await client.xautoclaim(
+            settings.email_queue_stream,
+            settings.email_queue_group,
+            cls.consumer,
+            min_idle_time=int(settings.email_queue_visibility_timeout * 1000),
+            start_id="0-0",
+            count=settings.email_queue_batch_size
+        )
+        entries = [entry for entry in result[1] if entry and entry[1]]
+        if entries:
+            logger.warning("email_jobs_reclaimed", count=len(entries))
+        return entries
+
+    @classmethod
+    async def _handle(cls, client, entry_id: bytes, fields: Dict[bytes, bytes]) -> None:
+        try:
+            job = JSONCodec.loads(fields[b"job"])
+        except Exception as e:
+            logger.error("email_job_invalid", entry_id=entry_id, error=str(e))
+            await client.xack(settings.email_queue_stream, settings.email_queue_group, entry_id)
+            return
+
+        try:
+            sent = await EmailQueue.dispatch(job)
+        except Exception as e:
+            logger.error("email_job_error", job_id=job.get("id"), error=str(e))
+            sent = False
+
+        pipe = client.pipeline(transaction=True)
+        if sent:
+            email_jobs_total.inc(event="sent")
+            logger.info("email_job_sent", job_id=job.get("id"), kind=job.get("kind"), attempts=job["attempts"] + 1)
+        else:
+            job["attempts"] += 1
+            if job["attempts"] >= settings.email_queue_max_attempts or job.get("kind") not in EMAIL_JOBS:
+                email_jobs_total.inc(event="dead")
+                logger.error("email_job_dead", job_id=job.get("id"), kind=job.get("kind"), attempts=job["attempts"])
+                pipe.xadd(settings.email_queue_dead_stream, {"job": JSONCodec.dumps(redact_job(job))},
+                          maxlen=settings.email_queue_maxlen, approximate=True)
+            else:
+                delay = backoff_delay(job["attempts"])
+                email_jobs_total.inc(event="retried")
+                logger.warning("email_job_retry", job_id=job["id"], attempts=job["attempts"], delay=round(delay, 2))
+                pipe.zadd(settings.email_queue_delayed_key, {JSONCodec.dumps(job): time.time() + delay})
+        pipe.xack(settings.email_queue_stream, settings.email_queue_group, entry_id)
+        pipe.xdel(settings.email_queue_stream, entry_id)
+        await pipe.execute()
+
+    @classmethod
+    async def run_once(cls, client, block_ms: int = 1000) -> int:
+        await cls._ensure_group(client)
+        await cls._promote_due(client)
+
+        entries = await cls._claim_stale(client)
+        if not entries:
+            response = await client.xreadgroup(
+                settings.email_queue_group,
+                cls.consumer,
+                {settings.email_queue_stream: ">"},
+                count=settings.email_queue_batch_size,
+                block=block_ms
+            )
+            entries = [entry for _, stream_entries in response or [] for entry in stream_entries]
+
+        if entries:
+            await asyncio.gather(*(cls._handle(client, entry_id, fields) for entry_id, fields in entries))
+        return len(entries)
+
+    @classmethod
+    async def run(cls) -> None:
+        cls._running = True
+        logger.info("email_worker_started", consumer=cls.consumer, stream=settings.email_queue_stream)
+        while cls._running:
+            try:
+                client = await RedisCache.get_instance()
+                if client is None:
+                    await asyncio.sleep(5)
+                    continue
+                await cls.run_once(client)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("email_worker_error", error=str(e))
+                cls._group_ready = False
+                await asyncio.sleep(1)
+        logger.info("email_worker_stopped", consumer=cls.consumer)
+
+    @classmethod
+    def start(cls) -> None:
+        if cls._task is None:
+            cls._task = asyncio.create_task(cls.run())
+
+    @classmethod
+    def request_stop(cls) -> None:
+        cls._running = False
+
+    @classmethod
+    async def stop(cls, timeout: float = 10.0) -> None:
+        cls.request_stop()
+        if cls._task is not None:
+            try:
+                await asyncio.wait_for(cls._task, timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning("email_worker_stop_timeout", consumer=cls.consumer)
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
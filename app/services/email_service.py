@@ -1,361 +1,240 @@
 import aiosmtplib
+from collections import deque
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from jinja2 import Template
 from app.core.config import settings
 from app.core.logging import get_logger
-from typing import Optional
+from app.services.email_templates import EmailTemplateRegistry
+from typing import Any, Deque, Dict, List, Optional
+import asyncio
+import time
 import traceback
 
 logger = get_logger(__name__)
 
+_CONNECTION_ERRORS = (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPTimeoutError, ConnectionError)
 
-class EmailService:
 
-    @staticmethod
-    def _get_password_reset_template() -> str:
-        return """
-        <!DOCTYPE html>
-        <html lang="pt-BR">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Recuperação de Senha</title>
-            <style>
-                body {
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    margin: 0;
-                    padding: 0;
-                    background-color: #f4f4f4;
-                }
-                .container {
-                    max-width: 600px;
-                    margin: 40px auto;
-                    background: #ffffff;
-                    border-radius: 8px;
-                    overflow: hidden;
-                    box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-                }
-                .header {
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    padding: 40px 30px;
-                    text-align: center;
-                }
-                .header h1 {
-                    margin: 0;
-                    font-size: 28px;
-                    font-weight: 600;
-                }
-                .content {
-                    padding: 40px 30px;
-                }
-                .content p {
-                    margin: 0 0 20px 0;
-                    font-size: 16px;
-                    color: #555;
-                }
-                .button-container {
-                    text-align: center;
-                    margin: 30px 0;
-                }
-                .button {
-                    display: inline-block;
-                    padding: 14px 40px;
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white !important;
-                    text-decoration: none;
-                    border-radius: 6px;
-                    font-weight: 600;
-                    font-size: 16px;
-                    transition: transform 0.2s;
-                }
-                .button:hover {
-                    transform: translateY(-2px);
-                }
-                .token-box {
-                    background: #f8f9fa;
-                    border: 2px dashed #dee2e6;
-                    border-radius: 6px;
-                    padding: 15px;
-                    margin: 20px 0;
-                    text-align: center;
-                    font-family: 'Courier New', monospace;
-                    font-size: 14px;
-                    color: #495057;
-                    word-break: break-all;
-                }
-                .warning {
-                    background: #fff3cd;
-                    border-left: 4px solid #ffc107;
-                    padding: 15px;
-                    margin: 20px 0;
-                    border-radius: 4px;
-                }
-                .warning p {
-                    margin: 0;
-                    color: #856404;
-                    font-size: 14px;
-                }
-                .footer {
-                    background: #f8f9fa;
-                    padding: 20px 30px;
-                    text-align: center;
-                    font-size: 14px;
-                    color: #6c757d;
-                }
-                .footer p {
-                    margin: 5px 0;
-                }
-                .divider {
-                    height: 1px;
-                    background: #e9ecef;
-                    margin: 30px 0;
-                }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>🔐 Recuperação de Senha</h1>
-                </div>
-                <div class="content">
-                    <p>Olá, <strong>{{ user_name }}</strong>!</p>
-                    <p>Recebemos uma solicitação para redefinir a senha da sua conta.</p>
-                    <p>Clique no botão abaixo para criar uma nova senha:</p>
-
-                    <div class="button-container">
-                        <a href="{{ reset_link }}" class="button">Redefinir Senha</a>
-                    </div>
-
-                    <div class="divider"></div>
-
-                    <p style="font-size: 14px; color: #6c757d;">
-                        Se o botão não funcionar, copie e cole o link abaixo no seu navegador:
-                    </p>
-                    <div class="token-box">
-                        {{ reset_link }}
-                    </div>
-
-                    <div class="warning">
-                        <p><strong>⚠️ Importante:</strong></p>
-                        <p>Este link expira em <strong>{{ expiration_time }}</strong>.</p>
-                        <p>Se você não solicitou esta recuperação, ignore este e-mail.</p>
-                    </div>
-
-                    <div class="divider"></div>
-
-                    <p style="font-size: 14px; color: #6c757d;">
-                        Por questões de segurança, nunca compartilhe este link com outras pessoas.
-                    </p>
-                </div>
-                <div class="footer">
-                    <p><strong>{{ app_name }}</strong></p>
-                    <p>Este é um e-mail automático, por favor não responda.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+class PooledSMTPConnection:
+
+    def __init__(self, smtp: aiosmtplib.SMTP):
+        self.smtp = smtp
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.messages_sent = 0
+
+    @property
+    def exhausted(self) -> bool:
+        return self.messages_sent >= settings.smtp_max_messages_per_connection
+
+
+class SMTPConnectionPool:
+    _idle: Deque[PooledSMTPConnection] = deque()
+    _semaphore: Optional[asyncio.Semaphore] = None
+    _in_use: int = 0
+    _opened: int = 0
+    _discarded: int = 0
 
     @staticmethod
-    def _get_password_changed_template() -> str:
-        return """
-        <!DOCTYPE html>
-        <html lang="pt-BR">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Senha Alterada</title>
-            <style>
-                body {
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    margin: 0;
-                    padding: 0;
-                    background-color: #f4f4f4;
-                }
-                .container {
-                    max-width: 600px;
-                    margin: 40px auto;
-                    background: #ffffff;
-                    border-radius: 8px;
-                    overflow: hidden;
-                    box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-                }
-                .header {
-                    background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
-                    color: white;
-                    padding: 40px 30px;
-                    text-align: center;
-                }
-                .header h1 {
-                    margin: 0;
-                    font-size: 28px;
-                    font-weight: 600;
-                }
-                .content {
-                    padding: 40px 30px;
-                }
-                .content p {
-                    margin: 0 0 20px 0;
-                    font-size: 16px;
-                    color: #555;
-                }
-                .success-icon {
-                    text-align: center;
-                    font-size: 60px;
-                    margin: 20px 0;
-                }
-                .warning {
-                    background: #fff3cd;
-                    border-left: 4px solid #ffc107;
-                    padding: 15px;
-                    margin: 20px 0;
-                    border-radius: 4px;
-                }
-                .warning p {
-                    margin: 0;
-                    color: #856404;
-                    font-size: 14px;
-                }
-                .footer {
-                    background: #f8f9fa;
-                    padding: 20px 30px;
-                    text-align: center;
-                    font-size: 14px;
-                    color: #6c757d;
-                }
-                .footer p {
-                    margin: 5px 0;
-                }
-                .divider {
-                    height: 1px;
-                    background: #e9ecef;
-                    margin: 30px 0;
-                }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>✅ Senha Alterada</h1>
-                </div>
-                <div class="content">
-                    <div class="success-icon">🎉</div>
-                    <p>Olá, <strong>{{ user_name }}</strong>!</p>
-                    <p>Sua senha foi alterada com sucesso em <strong>{{ change_date }}</strong>.</p>
-                    <p>Você já pode fazer login com sua nova senha.</p>
-
-                    <div class="warning">
-                        <p><strong>⚠️ Você não fez esta alteração?</strong></p>
-                        <p>Se você não solicitou esta mudança, entre em contato conosco imediatamente.</p>
-                    </div>
-
-                    <div class="divider"></div>
-
-                    <p style="font-size: 14px; color: #6c757d;">
-                        Recomendamos que você use uma senha forte e única para proteger sua conta.
-                    </p>
-                </div>
-                <div class="footer">
-                    <p><strong>{{ app_name }}</strong></p>
-                    <p>Este é um e-mail automático, por favor não responda.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+    async def _connect() -> PooledSMTPConnection:
+        if settings.smtp_ssl:
+            smtp = aiosmtplib.SMTP(
+                hostname=settings.smtp_host,
+                port=settings.smtp_port,
+                use_tls=True,
+                timeout=settings.smtp_timeout
+            )
+        else:
+            smtp = aiosmtplib.SMTP(
+                hostname=settings.smtp_host,
+                port=settings.smtp_port,
+                start_tls=settings.smtp_tls,
+                timeout=settings.smtp_timeout
+            )
+
+        await smtp.connect()
+
+        if settings.smtp_username and settings.smtp_password:
+            await smtp.login(settings.smtp_username, settings.smtp_password)
+
+        SMTPConnectionPool._opened += 1
+        logger.debug("smtp_connection_opened", host=settings.smtp_host)
+        return PooledSMTPConnection(smtp)
+
+    @classmethod
+    async def _discard(cls, connection: PooledSMTPConnection) -> None:
+        cls._discarded += 1
+        try:
+            if connection.smtp.is_connected:
+                await connection.smtp.quit()
+        except Exception:
+            connection.smtp.close()
+
+    @classmethod
+    async def _is_healthy(cls, connection: PooledSMTPConnection) -> bool:
+        idle_for = time.monotonic() - connection.last_used
+        if not connection.smtp.is_connected or idle_for > settings.smtp_pool_idle_timeout or connection.exhausted:
+            return False
+        if idle_for < settings.smtp_pool_health_check_interval:
+            return True
+        try:
+            await connection.smtp.noop()
+            return True
+        except Exception as e:
+            logger.debug("smtp_connection_stale", error=str(e))
+            return False
+
+    @classmethod
+    async def acquire(cls) -> PooledSMTPConnection:
+        if cls._semaphore is None:
+            cls._semaphore = asyncio.Semaphore(settings.smtp_pool_size)
+
+        await cls._semaphore.acquire()
+        try:
+            while cls._idle:
+                connection = cls._idle.pop()
+                if await cls._is_healthy(connection):
+                    cls._in_use += 1
+                    return connection
+                await cls._discard(connection)
+
+            connection = await cls._connect()
+            cls._in_use += 1
+            return connection
+        except BaseException:
+            cls._semaphore.release()
+            raise
+
+    @classmethod
+    async def release(cls, connection: PooledSMTPConnection, reusable: bool = True) -> None:
+        cls._in_use -= 1
+        try:
+            if reusable and connection.smtp.is_connected and not connection.exhausted:
+                connection.last_used = time.monotonic()
+                cls._idle.append(connection)
+            else:
+                await cls._discard(connection)
+        finally:
+            cls._semaphore.release()
+
+    @classmethod
+    async def close(cls) -> None:
+        while cls._idle:
+            await cls._discard(cls._idle.pop())
+        logger.info("smtp_pool_closed", opened=cls._opened)
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        return {
+            "idle": len(cls._idle),
+            "in_use": cls._in_use,
+            "opened": cls._opened,
+            "discarded": cls._discarded
+        }
+
+
+class EmailService:
 
     @staticmethod
-    async def send_email(
+    def _build_message(
             to_email: str,
             subject: str,
             html_content: str,
             text_content: Optional[str] = None
-    ) -> bool:
-        try:
-            message = MIMEMultipart("alternative")
-            message["From"] = f"{settings.smtp_from_name} <{settings.smtp_from_email}>"
-            message["To"] = to_email
-            message["Subject"] = subject
-
-            if text_content:
-                part1 = MIMEText(text_content, "plain")
-                message.attach(part1)
-
-            part2 = MIMEText(html_content, "html")
-            message.attach(part2)
-
-            if settings.smtp_ssl:
-                smtp = aiosmtplib.SMTP(
-                    hostname=settings.smtp_host,
-                    port=settings.smtp_port,
-                    use_tls=True
-                )
-            else:
-                smtp = aiosmtplib.SMTP(
-                    hostname=settings.smtp_host,
-                    port=settings.smtp_port,
-                    start_tls=settings.smtp_tls
-                )
-
-            await smtp.connect()
+    ) -> MIMEMultipart:
+        message = MIMEMultipart("alternative")
+        message["From"] = f"{settings.smtp_from_name} <{settings.smtp_from_email}>"
+        message["To"] = to_email
+        message["Subject"] = subject
 
-            if settings.smtp_username and settings.smtp_password:
-                await smtp.login(settings.smtp_username, settings.smtp_password)
+        if text_content:
+            part1 = MIMEText(text_content, "plain")
+            message.attach(part1)
 
-            await smtp.send_message(message)
-            await smtp.quit()
+        part2 = MIMEText(html_content, "html")
+        message.attach(part2)
+        return message
 
-            logger.info("email_sent", to_email=to_email, subject=subject)
-            return True
+    @staticmethod
+    async def send_email(
+            to_email: str,
+            subject: str,
+            html_content: str,
+            text_content: Optional[str] = None
+    ) -> bool:
+        results = await EmailService.send_many([{
+            "to_email": to_email,
+            "subject": subject,
+            "html_content": html_content,
+            "text_content": text_content
+        }])
+        return results[0]
 
-        except Exception as e:
-            logger.error("email_send_error", to_email=to_email, error=str(e), traceback=traceback.format_exc())
-            return False
+    @staticmethod
+    async def send_many(messages: List[Dict[str, Any]]) -> List[bool]:
+        results = [False] * len(messages)
+        pending = deque(range(len(messages)))
+        retried = set()
+
+        while pending:
+            try:
+                connection = await SMTPConnectionPool.acquire()
+            except Exception as e:
+                logger.error("smtp_connect_error", pending=len(pending), error=str(e), traceback=traceback.format_exc())
+                break
+
+            reusable = False
+            try:
+                while pending and not connection.exhausted:
+                    index = pending[0]
+                    email = messages[index]
+                    try:
+                        await connection.smtp.send_message(EmailService._build_message(**email))
+                    except _CONNECTION_ERRORS as e:
+                        # Sessão perdida: a mensagem é reenviada uma vez em uma nova conexão
+                        if index in retried:
+                            logger.error("email_send_error", to_email=email["to_email"], error=str(e))
+                            pending.popleft()
+                        retried.add(index)
+                        break
+                    except Exception as e:
+                        logger.error("email_send_error", to_email=email["to_email"], error=str(e))
+                        pending.popleft()
+                        continue
+
+                    pending.popleft()
+                    connection.messages_sent += 1
+                    results[index] = True
+                    logger.info("email_sent", to_email=email["to_email"], subject=email["subject"])
+                else:
+                    reusable = True
+            finally:
+                await SMTPConnectionPool.release(connection, reusable=reusable)
+
+        return results
 
     @staticmethod
     async def send_password_reset_email(
             to_email: str,
             user_name: str,
             reset_token: str,
-            expiration_hours: int = 1
+            expiration_hours: int = 1,
+            locale: Optional[str] = None
     ) -> bool:
         try:
-            reset_link = f"{settings.frontend_url}/reset-password?token={reset_token}"
-
-            template = Template(EmailService._get_password_reset_template())
-            html_content = template.render(
+            email = EmailTemplateRegistry.render(
+                "password_reset",
+                locale=locale,
                 user_name=user_name,
-                reset_link=reset_link,
-                expiration_time=f"{expiration_hours} hora(s)",
-                app_name=settings.smtp_from_name
+                reset_link=f"{settings.frontend_url}/reset-password?token={reset_token}",
+                expiration_hours=expiration_hours
             )
 
-            text_content = f"""
-            Olá, {user_name}!
-
-            Recebemos uma solicitação para redefinir a senha da sua conta.
-
-            Acesse o link abaixo para criar uma nova senha:
-            {reset_link}
-
-            Este link expira em {expiration_hours} hora(s).
-
-            Se você não solicitou esta recuperação, ignore este e-mail.
-
-            {settings.smtp_from_name}
-            """
-
             return await EmailService.send_email(
                 to_email=to_email,
-                subject="Recuperação de Senha",
-                html_content=html_content,
-                text_content=text_content
+                subject=email.subject,
+                html_content=email.html_content,
+                text_content=email.text_content
             )
 
         except Exception as e:
@@ -366,34 +245,24 @@ class EmailService:
     async def send_password_changed_email(
             to_email: str,
             user_name: str,
-            change_date: str
+            change_date: str,
+            locale: Optional[str] = None
     ) -> bool:
         try:
-            template = Template(EmailService._get_password_changed_template())
-            html_content = template.render(
+            email = EmailTemplateRegistry.render(
+                "password_changed",
+                locale=locale,
                 user_name=user_name,
-                change_date=change_date,
-                app_name=settings.smtp_from_name
+                change_date=change_date
             )
 
-            text_content = f"""
-            Olá, {user_name}!
-
-            Sua senha foi alterada com sucesso em {change_date}.
-
-            Se você não fez esta alteração, entre em contato conosco imediatamente.
-
-            {settings.smtp_from_name}
-            """
-
             return await EmailService.send_email(
                 to_email=to_email,
-                subject="Senha Alterada com Sucesso",
-                html_content=html_content,
-                text_content=text_content
+                subject=email.subject,
+                html_content=email.html_content,
+                text_content=email.text_content
             )
 
         except Exception as e:
             logger.error("password_changed_email_error", to_email=to_email, error=str(e))
             return False
-
@@ -0,0 +1,106 @@
+from typing import Any, Dict, Optional, Tuple
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    StrictUndefined,
+    Template,
+    select_autoescape
+)
+from app.core.config import settings
+from app.core.logging import get_logger
+import os
+import time
+
+logger = get_logger(__name__)
+
+TEMPLATE_DIR = settings.email_template_dir or os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "templates", "email"
+)
+PARTS = ("subject.txt", "html", "txt")
+
+
+class RenderedEmail:
+    __slots__ = ("subject", "html_content", "text_content")
+
+    def __init__(self, subject: str, html_content: str, text_content: str):
+        self.subject = subject
+        self.html_content = html_content
+        self.text_content = text_content
+
+
+class EmailTemplateRegistry:
+    _env: Optional[Environment] = None
+    _templates: Dict[Tuple[str, str], Tuple[Template, Template, Template]] = {}
+
+    @classmethod
+    def get_environment(cls) -> Environment:
+        if cls._env is None:
+            bytecode_cache = None
+            if settings.email_template_bytecode_cache != "none":
+                directory = settings.email_template_bytecode_cache or None
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(directory)
+
+            cls._env = Environment(
+                loader=FileSystemLoader(TEMPLATE_DIR),
+                autoescape=select_autoescape(enabled_extensions=("html",), default_for_string=False),
+                bytecode_cache=bytecode_cache,
+                auto_reload=settings.email_template_auto_reload,
+                undefined=StrictUndefined,
+                keep_trailing_newline=False
+            )
+            # Valores fixos por processo entram como globais e não precisam ser passados a cada renderização
+            cls._env.globals.update(
+                app_name=settings.smtp_from_name,
+                frontend_url=settings.frontend_url
+            )
+        return cls._env
+
+    @classmethod
+    def _resolve(cls, name: str, locale: Optional[str]) -> Tuple[Template, Template, Template]:
+        locale = locale or settings.email_default_locale
+        templates = cls._templates.get((name, locale))
+        if templates is None:
+            env = cls.get_environment()
+            candidates = [locale, settings.email_default_locale]
+            templates = tuple(
+                env.select_template([f"{candidate}/{name}.{part}" for candidate in candidates])
+                for part in PARTS
+            )
+            if not env.auto_reload:
+                cls._templates[(name, locale)] = templates
+        return templates
+
+    @classmethod
+    def render(cls, name: str, locale: Optional[str] = None, **context: Any) -> RenderedEmail:
+        subject, html, text = cls._resolve(name, locale)
+        return RenderedEmail(
+            subject=subject.render(**context).strip(),
+            html_content=html.render(**context),
+            text_content=text.render(**context)
+        )
+
+    @classmethod
+    def warm(cls) -> int:
+        started = time.perf_counter()
+        loaded = 0
+        env = cls.get_environment()
+        for template_name in env.list_templates(filter_func=lambda path: path.endswith(".html")):
+            locale, _, filename = template_name.partition("/")
+            if not filename:
+                continue
+            cls._resolve(filename[:-len(".html")], locale)
+            loaded += 1
+        logger.info(
+            "email_templates_loaded",
+            templates=loaded,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 2)
+        )
+        return loaded
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._templates = {}
+        cls._env = None
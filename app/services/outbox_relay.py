@@ -0,0 +1,129 @@
+from typing import Awaitable, Callable, Dict, Optional
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.logging import get_logger
+from app.core.metrics import outbox_events_total
+from app.models.outbox_model import OutboxEventModel
+from app.repositories.outbox_repository import OutboxRepository
+from app.services.email_queue import EmailQueue
+import asyncio
+import random
+
+logger = get_logger(__name__)
+
+
+async def _relay_email(event: OutboxEventModel) -> None:
+    job = EmailQueue.new_job(event.payload["kind"], event.payload["params"], job_id=f"outbox-{event.id}")
+    try:
+        if await EmailQueue.publish(job):
+            return
+    except Exception as e:
+        logger.warning("outbox_email_queue_unavailable", event_id=event.id, error=str(e))
+
+    # Sem fila disponível o relay envia diretamente; a linha só sai do outbox após o envio
+    if not await EmailQueue.dispatch(job):
+        raise RuntimeError(f"Falha ao enviar e-mail {job['kind']}")
+
+
+OUTBOX_HANDLERS: Dict[str, Callable[[OutboxEventModel], Awaitable[None]]] = {
+    "email": _relay_email,
+}
+
+
+class OutboxRelay:
+    _task: Optional[asyncio.Task] = None
+    _running: bool = False
+    _wakeup: Optional[asyncio.Event] = None
+
+    @staticmethod
+    def backoff_delay(attempts: int) -> float:
+        delay = min(settings.outbox_backoff_max, settings.outbox_backoff_base * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    @classmethod
+    def notify(cls) -> None:
+        if cls._wakeup is not None:
+            cls._wakeup.set()
+
+    @staticmethod
+    async def _deliver(event: OutboxEventModel) -> Optional[str]:
+        handler = OUTBOX_HANDLERS.get(event.event_type)
+        if handler is None:
+            return f"Tipo de evento desconhecido: {event.event_type}"
+        try:
+            await handler(event)
+            return None
+        except Exception as e:
+            return str(e) or type(e).__name__
+
+    @classmethod
+    async def relay_batch(cls) -> int:
+        async with async_session_maker() as db:
+            events = await OutboxRepository.claim_batch(settings.outbox_batch_size, settings.outbox_lease_seconds, db)
+        if not events:
+            return 0
+
+        # Entrega fora de qualquer transação: um SMTP lento não segura conexão do pool nem locks de linha
+        errors = await asyncio.gather(*(cls._deliver(event) for event in events))
+
+        async with async_session_maker() as db:
+            for event, error in zip(events, errors):
+                if error is None:
+                    await OutboxRepository.mark_delivered(event.id, db)
+                    outbox_events_total.inc(event_type=event.event_type, outcome="delivered")
+                elif event.attempts >= settings.outbox_max_attempts or event.event_type not in OUTBOX_HANDLERS:
+                    await OutboxRepository.mark_failed(event.id, error, db)
+                    outbox_events_total.inc(event_type=event.event_type, outcome="failed")
+                    logger.error("outbox_event_failed", event_id=event.id, event_type=event.event_type,
+                                 attempts=event.attempts, error=error)
+                else:
+                    await OutboxRepository.mark_retry(event.id, error, cls.backoff_delay(event.attempts), db)
+                    outbox_events_total.inc(event_type=event.event_type, outcome="retried")
+                    logger.warning("outbox_event_retry", event_id=event.id, event_type=event.event_type,
+                                   attempts=event.attempts, error=error)
+            await db.commit()
+        return len(events)
+
+    @classmethod
+    async def run(cls) -> None:
+        cls._running = True
+        cls._wakeup = asyncio.Event()
+        logger.info("outbox_relay_started", batch_size=settings.outbox_batch_size)
+        while cls._running:
+            try:
+                relayed = await cls.relay_batch()
+                if relayed >= settings.outbox_batch_size:
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("outbox_relay_error", error=str(e))
+
+            try:
+                await asyncio.wait_for(cls._wakeup.wait(), timeout=settings.outbox_poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            cls._wakeup.clear()
+        logger.info("outbox_relay_stopped")
+
+    @classmethod
+    def start(cls) -> None:
+        if cls._task is None:
+            cls._task = asyncio.create_task(cls.run())
+
+    @classmethod
+    def request_stop(cls) -> None:
+        cls._running = False
+        cls.notify()
+
+    @classmethod
+    async def stop(cls, timeout: float = 10.0) -> None:
+        cls.request_stop()
+        if cls._task is not None:
+            try:
+                await asyncio.wait_for(cls._task, timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning("outbox_relay_stop_timeout")
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
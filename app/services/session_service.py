@@ -0,0 +1,390 @@
+from typing import Any, Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import RedisCache
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.logging import get_logger
+from app.core.metrics import session_events_total
+from app.core.security import create_access_token, create_refresh_token, hash_refresh_token
+from app.exceptions import InvalidTokenException, RefreshTokenExpiredException, RefreshTokenReusedException
+from app.models.session_model import UserSessionModel
+from app.repositories.session_repository import SessionRepository
+from app.repositories.user_repository import UserRepository
+from datetime import datetime, timedelta, timezone
+import asyncio
+import secrets
+import time
+import uuid
+
+logger = get_logger(__name__)
+
+PENDING_ROTATIONS_KEY = "sessions:pending"
+
+# A rotação e o registro para persistência assíncrona no banco acontecem no mesmo script
+_ROTATE_SCRIPT = """
+local s = redis.call('HMGET', KEYS[1], 'token_hash', 'prev_hash', 'rotated_at')
+if not s[1] then
+    return 'missing'
+end
+if s[1] == ARGV[1] then
+    redis.call('HSET', KEYS[1], 'token_hash', ARGV[2], 'generation', ARGV[3], 'prev_hash', ARGV[1], 'rotated_at', ARGV[4])
+    redis.call('HSET', KEYS[2], ARGV[6], ARGV[3] .. ':' .. ARGV[2])
+    return 'rotated'
+end
+if s[2] == ARGV[1] and tonumber(ARGV[4]) - tonumber(s[3]) <= tonumber(ARGV[5]) then
+    return 'grace'
+end
+return 'reuse'
+"""
+
+# Só remove a pendência se ela não mudou desde a leitura; rotações mais novas ficam para o próximo ciclo
+_ACK_PENDING_SCRIPT = """
+local removed = 0
+for i = 1, #ARGV, 2 do
+    if redis.call('HGET', KEYS[1], ARGV[i]) == ARGV[i + 1] then
+        removed = removed + redis.call('HDEL', KEYS[1], ARGV[i])
+    end
+end
+return removed
+"""
+
+
+def _session_key(session_id: str) -> str:
+    return f"session:{session_id}"
+
+
+def _user_sessions_key(user_id: int) -> str:
+    return f"user_sessions:{user_id}"
+
+
+class SessionService:
+    _scripts: Dict[str, Any] = {}
+    _script_client = None
+
+    @classmethod
+    def _get_script(cls, client, source: str):
+        if cls._script_client is not client:
+            cls._scripts = {}
+            cls._script_client = client
+        if source not in cls._scripts:
+            cls._scripts[source] = client.register_script(source)
+        return cls._scripts[source]
+
+    @staticmethod
+    def _issue_tokens(
+            user_id: int,
+            email: str,
+            session_id: str,
+            generation: int,
+            expires_at: datetime
+    ) -> Dict[str, str]:
+        token_data = {"user_id": user_id, "email": email, "sid": session_id}
+        refresh_token = create_refresh_token(
+            {**token_data, "gen": generation, "jti": secrets.token_hex(8)},
+            expires_at=expires_at
+        )
+        return {
+            "access_token": create_access_token(token_data),
+            "refresh_token": refresh_token,
+            "token_type": "bearer"
+        }
+
+    @staticmethod
+    async def _cache_session(
+            session_id: str,
+            user_id: int,
+            token_hash: str,
+            generation: int,
+            expires_at: datetime
+    ) -> None:
+        try:
+            client = await RedisCache.get_instance()
+            if client is None:
+                return
+
+            pipe = client.pipeline(transaction=True)
+            pipe.hset(_session_key(session_id), mapping={
+                "user_id": user_id,
+                "token_hash": token_hash,
+                "generation": generation
+            })
+            pipe.expireat(_session_key(session_id), int(expires_at.timestamp()))
+            pipe.sadd(_user_sessions_key(user_id), session_id)
+            pipe.expire(_user_sessions_key(user_id), settings.refresh_token_expire_days * 86400)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("session_cache_write_failed", session_id=session_id, error=str(e))
+
+    @staticmethod
+    async def _forget_cached(user_id: int, session_id: str) -> None:
+        try:
+            client = await RedisCache.get_instance()
+            if client is None:
+                return
+
+            pipe = client.pipeline(transaction=True)
+            pipe.delete(_session_key(session_id))
+            pipe.srem(_user_sessions_key(user_id), session_id)
+            pipe.hdel(PENDING_ROTATIONS_KEY, session_id)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("session_cache_delete_failed", user_id=user_id, error=str(e))
+
+    @classmethod
+    async def _rotate_cached(
+            cls,
+            session_id: str,
+            presented_hash: str,
+            new_hash: str,
+            new_generation: int
+    ) -> Optional[str]:
+        try:
+            client = await RedisCache.get_instance()
+            if client is None:
+                return None
+
+            status = await cls._get_script(client, _ROTATE_SCRIPT)(
+                keys=[_session_key(session_id), PENDING_ROTATIONS_KEY],
+                args=[
+                    presented_hash,
+                    new_hash,
+                    new_generation,
+                    time.time(),
+                    settings.session_reuse_grace_seconds,
+                    session_id
+                ]
+            )
+            return status.decode() if isinstance(status, bytes) else status
+        except Exception as e:
+            logger.warning("session_cache_unavailable", session_id=session_id, error=str(e))
+            return None
+
+    @classmethod
+    async def create(
+            cls,
+            user_id: int,
+            email: str,
+            db: AsyncSession,
+            last_login: Optional[datetime] = None
+    ) -> Dict[str, str]:
+        session_id = uuid.uuid4().hex
+        expires_at = datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days)
+        tokens = cls._issue_tokens(user_id, email, session_id, 1, expires_at)
+        token_hash = hash_refresh_token(tokens["refresh_token"])
+
+        SessionRepository.add(
+            UserSessionModel(
+                id=session_id,
+                user_id=user_id,
+                token_hash=token_hash,
+                generation=1,
+                expires_at=expires_at
+            ),
+            db
+        )
+        if last_login is not None:
+            # O UPDATE do last_login confirma também a sessão: o login grava uma única transação
+            await UserRepository.update_login(user_id, last_login, db)
+        else:
+            await db.commit()
+        await cls._cache_session(session_id, user_id, token_hash, 1, expires_at)
+
+        session_events_total.inc(event="created")
+        logger.info("session_created", user_id=user_id, session_id=session_id)
+        return tokens
+
+    @classmethod
+    async def refresh(cls, payload: Dict[str, Any], refresh_token: str, db: AsyncSession) -> Dict[str, str]:
+        session_id = payload["sid"]
+        user_id = payload["user_id"]
+        generation = int(payload.get("gen", 1))
+        expires_at = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+
+        tokens = cls._issue_tokens(user_id, payload.get("email"), session_id, generation + 1, expires_at)
+        presented_hash = hash_refresh_token(refresh_token)
+        new_hash = hash_refresh_token(tokens["refresh_token"])
+
+        status = await cls._rotate_cached(session_id, presented_hash, new_hash, generation + 1)
+        if status == "grace":
+            # Renovação concorrente do mesmo dispositivo: recusa sem derrubar a sessão
+            session_events_total.inc(event="concurrent_refresh")
+            raise InvalidTokenException(message="Refresh token já renovado por outra requisição")
+        if status == "reuse":
+            await cls._revoke_reused(session_id, user_id, db)
+            raise RefreshTokenReusedException()
+        if status == "rotated":
+            # O banco recebe a rotação depois, em lote, pelo SessionFlusher
+            session_events_total.inc(event="rotated")
+            return tokens
+
+        # Sessão fora do Redis (reinício, despejo ou Redis indisponível): o banco é a fonte de verdade
+        await cls._persist_pending_session(session_id, db)
+        session = await SessionRepository.find_by_id(session_id, db)
+        if session is None or session.revoked_at is not None or session.user_id != user_id:
+            raise InvalidTokenException(message="Sessão encerrada. Faça login novamente")
+        if session.expires_at < datetime.now(timezone.utc):
+            raise RefreshTokenExpiredException()
+
+        # Só a geração persistida é aceita; rotações perdidas junto com o Redis exigem novo login
+        if generation != session.generation or session.token_hash != presented_hash:
+            await cls._revoke_reused(session_id, user_id, db)
+            raise RefreshTokenReusedException()
+
+        # O primeiro a apresentar o token vence; quem perde a corrida derruba a sessão
+        if not await SessionRepository.update_token(session_id, generation, presented_hash, new_hash, db):
+            await cls._revoke_reused(session_id, user_id, db)
+            raise RefreshTokenReusedException()
+        await cls._cache_session(session_id, user_id, new_hash, generation + 1, expires_at)
+
+        session_events_total.inc(event="rotated_db")
+        return tokens
+
+    @classmethod
+    async def _persist_rotations(cls, client, rotations: Dict[bytes, bytes], db: AsyncSession) -> int:
+        persisted = 0
+        for session_id, value in rotations.items():
+            generation, token_hash = value.decode().split(":", 1)
+            persisted += await SessionRepository.persist_rotation(session_id.decode(), int(generation), token_hash, db)
+        await db.commit()
+
+        await cls._get_script(client, _ACK_PENDING_SCRIPT)(
+            keys=[PENDING_ROTATIONS_KEY],
+            args=[item for rotation in rotations.items() for item in rotation]
+        )
+        return persisted
+
+    @classmethod
+    async def _persist_pending_session(cls, session_id: str, db: AsyncSession) -> None:
+        try:
+            client = await RedisCache.get_instance()
+            if client is None:
+                return
+
+            pending = await client.hget(PENDING_ROTATIONS_KEY, session_id)
+            if pending is not None:
+                await cls._persist_rotations(client, {session_id.encode(): pending}, db)
+        except Exception as e:
+            logger.warning("session_pending_persist_failed", session_id=session_id, error=str(e))
+
+    @classmethod
+    async def flush_pending(cls) -> int:
+        client = await RedisCache.get_instance()
+        if client is None:
+            return 0
+
+        persisted = 0
+        cursor = 0
+        while True:
+            cursor, rotations = await client.hscan(
+                PENDING_ROTATIONS_KEY, cursor, count=settings.session_flush_batch_size
+            )
+            if rotations:
+                async with async_session_maker() as db:
+                    persisted += await cls._persist_rotations(client, rotations, db)
+            if cursor == 0:
+                break
+
+        if persisted:
+            session_events_total.inc(persisted, event="persisted")
+        return persisted
+
+    @classmethod
+    async def _revoke_reused(cls, session_id: str, user_id: int, db: AsyncSession) -> None:
+        logger.warning("refresh_token_reuse_detected", user_id=user_id, session_id=session_id)
+        session_events_total.inc(event="reuse_detected")
+        await cls.revoke(session_id, user_id, db)
+
+    @classmethod
+    async def revoke(cls, session_id: str, user_id: int, db: AsyncSession) -> bool:
+        await cls._forget_cached(user_id, session_id)
+        revoked = await SessionRepository.revoke(session_id, db)
+        session_events_total.inc(event="revoked")
+        logger.info("session_revoked", user_id=user_id, session_id=session_id)
+        return revoked
+
+    @classmethod
+    async def revoke_all(cls, user_id: int, db: AsyncSession) -> int:
+        await cls.forget_user(user_id, *await SessionRepository.find_active_ids(user_id, db))
+        revoked = await SessionRepository.revoke_all_for_user(user_id, db)
+        session_events_total.inc(revoked, event="revoked")
+        logger.info("sessions_revoked", user_id=user_id, count=revoked)
+        return revoked
+
+    @classmethod
+    async def forget_user(cls, user_id: int, *session_ids: str) -> None:
+        try:
+            client = await RedisCache.get_instance()
+            if client is None:
+                return
+
+            cached = {member.decode() for member in await client.smembers(_user_sessions_key(user_id))}
+            known = cached.union(session_ids)
+            pipe = client.pipeline(transaction=True)
+            pipe.delete(_user_sessions_key(user_id), *(_session_key(session_id) for session_id in known))
+            if known:
+                pipe.hdel(PENDING_ROTATIONS_KEY, *known)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("session_cache_delete_failed", user_id=user_id, error=str(e))
+
+
+class SessionFlusher:
+    _task: Optional[asyncio.Task] = None
+    _running: bool = False
+    _wakeup: Optional[asyncio.Event] = None
+    _last_purge: float = 0.0
+
+    @staticmethod
+    async def purge() -> int:
+        before = datetime.now(timezone.utc) - timedelta(days=settings.session_retention_days)
+        async with async_session_maker() as db:
+            purged = await SessionRepository.purge_stale(before, db)
+        if purged:
+            session_events_total.inc(purged, event="purged")
+            logger.info("sessions_purged", count=purged)
+        return purged
+
+    @classmethod
+    async def run(cls) -> None:
+        cls._running = True
+        cls._wakeup = asyncio.Event()
+        logger.info("session_flusher_started", interval=settings.session_flush_interval)
+        while cls._running:
+            try:
+                await asyncio.wait_for(cls._wakeup.wait(), timeout=settings.session_flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                await SessionService.flush_pending()
+                if time.monotonic() - cls._last_purge >= settings.session_purge_interval:
+                    cls._last_purge = time.monotonic()
+                    await cls.purge()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("session_flusher_error", error=str(e))
+        logger.info("session_flusher_stopped")
+
+    @classmethod
+    def start(cls) -> None:
+        if cls._task is None:
+            cls._task = asyncio.create_task(cls.run())
+
+    @classmethod
+    def request_stop(cls) -> None:
+        cls._running = False
+        if cls._wakeup is not None:
+            cls._wakeup.set()
+
+    @classmethod
+    async def stop(cls, timeout: float = 10.0) -> None:
+        cls.request_stop()
+        if cls._task is not None:
+            try:
+                await asyncio.wait_for(cls._task, timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning("session_flusher_stop_timeout")
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
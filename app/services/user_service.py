@@ -1,10 +1,15 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional, Tuple
 from app.repositories.user_repository import UserRepository
+from app.services.session_service import SessionService
 from app.schemas.user_schema import User, UserResponse, UserResponsePublic, UserResponseLimited
-from app.core.security import hash_password
+from app.core.security import hash_password_async
 from app.core.logging import get_logger
-from app.core.cache import get_cache, set_cache, delete_cache
+from app.core.cache import TieredCache, SingleFlight
+from app.core.database import ReadYourWrites
+from app.core.serialization import CacheSerializer
+from app.utils.pagination import encode_cursor
 from app.exceptions import (
     EmailAlreadyExistsException,
     CPFAlreadyExistsException,
@@ -15,40 +20,43 @@ from app.exceptions import (
 
 logger = get_logger(__name__)
 
+CacheSerializer.register_model(UserResponse)
+
 
 class UserService:
 
     @staticmethod
     async def create_user(user_data: User, db: AsyncSession) -> UserResponse:
-        existing_user = await UserRepository.find_by_email(user_data.email, db)
-        if existing_user:
-            logger.warning("user_creation_failed", email=user_data.email, reason="email_exists")
-            raise EmailAlreadyExistsException(email=user_data.email)
-
-        existing_cpf = await UserRepository.find_by_cpf(user_data.cpf, db)
-        if existing_cpf:
-            logger.warning("user_creation_failed", cpf=user_data.cpf[:3] + "***", reason="cpf_exists")
-            raise CPFAlreadyExistsException(cpf=user_data.cpf)
-
-        senha_hash = hash_password(user_data.senha)
-
-        db_user = await UserRepository.create(
-            nome=user_data.nome,
-            sobrenome=user_data.sobrenome,
-            cpf=user_data.cpf,
-            email=user_data.email,
-            senha_hash=senha_hash,
-            db=db,
-            cep=user_data.cep,
-            logradouro=user_data.logradouro,
-            numero=user_data.numero,
-            complemento=user_data.complemento,
-            bairro=user_data.bairro,
-            cidade=user_data.cidade,
-            estado=user_data.estado
-        )
+        senha_hash = await hash_password_async(user_data.senha)
+
+        try:
+            db_user = await UserRepository.create(
+                nome=user_data.nome,
+                sobrenome=user_data.sobrenome,
+                cpf=user_data.cpf,
+                email=user_data.email,
+                senha_hash=senha_hash,
+                db=db,
+                cep=user_data.cep,
+                logradouro=user_data.logradouro,
+                numero=user_data.numero,
+                complemento=user_data.complemento,
+                bairro=user_data.bairro,
+                cidade=user_data.cidade,
+                estado=user_data.estado
+            )
+        except IntegrityError as e:
+            field = UserRepository.conflicting_field(e)
+            if field == "email":
+                logger.warning("user_creation_failed", email=user_data.email, reason="email_exists")
+                raise EmailAlreadyExistsException(email=user_data.email)
+            if field == "cpf":
+                logger.warning("user_creation_failed", cpf=user_data.cpf[:3] + "***", reason="cpf_exists")
+                raise CPFAlreadyExistsException(cpf=user_data.cpf)
+            raise
 
         logger.info("user_created", user_id=db_user.id, email=db_user.email)
+        await ReadYourWrites.mark(db_user.id)
 
         return UserResponse(
             id=db_user.id,
@@ -67,7 +75,7 @@ class UserService:
 
     @staticmethod
     async def get_all_users_public(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[UserResponsePublic]:
-        users = await UserRepository.find_all(db, skip=skip, limit=limit)
+        users = await UserRepository.find_all_public(db, skip=skip, limit=limit)
         logger.info("users_public_listed", count=len(users), skip=skip, limit=limit)
         return [
             UserResponsePublic(
@@ -78,18 +86,39 @@ class UserService:
             ) for user in users
         ]
 
+    @staticmethod
+    async def get_users_page_public(db: AsyncSession, after_id: int = 0,
+                                    limit: int = 100) -> Tuple[List[UserResponsePublic], Optional[str]]:
+        users = await UserRepository.find_all_public_after(db, after_id=after_id, limit=limit)
+        logger.info("users_public_listed", count=len(users), after_id=after_id, limit=limit)
+        next_cursor = encode_cursor(users[-1].id) if users and len(users) == limit else None
+        return [
+            UserResponsePublic(
+                id=user.id,
+                nome=user.nome,
+                sobrenome=user.sobrenome,
+                email=user.email
+            ) for user in users
+        ], next_cursor
+
     @staticmethod
     async def get_user_by_id(user_id: int, db: AsyncSession) -> UserResponse:
         cache_key = f"user:{user_id}"
 
         try:
-            cached_user = await get_cache(cache_key)
+            cached_user = await TieredCache.get(cache_key)
             if cached_user:
                 logger.info("user_retrieved_from_cache", user_id=user_id)
                 return cached_user
         except Exception as e:
             logger.warning("cache_get_failed", user_id=user_id, error=str(e))
 
+        user_response = await SingleFlight.do(cache_key, lambda: UserService._load_user(user_id, cache_key, db))
+        logger.info("user_retrieved", user_id=user_id)
+        return user_response
+
+    @staticmethod
+    async def _load_user(user_id: int, cache_key: str, db: AsyncSession) -> UserResponse:
         user = await UserRepository.find_by_id(user_id, db)
         if not user:
             logger.warning("user_not_found", user_id=user_id)
@@ -111,16 +140,15 @@ class UserService:
         )
 
         try:
-            await set_cache(cache_key, user_response, expire=300)
+            await TieredCache.set(cache_key, user_response, expire=300)
         except Exception as e:
             logger.warning("cache_set_failed", user_id=user_id, error=str(e))
 
-        logger.info("user_retrieved", user_id=user_id)
         return user_response
 
     @staticmethod
     async def get_user_by_email_public(email: str, db: AsyncSession) -> UserResponsePublic:
-        user = await UserRepository.find_by_email(email, db)
+        user = await UserRepository.find_public_by_email(email, db)
         if not user:
             logger.warning("user_not_found", email=email)
             raise UserNotFoundException(email=email)
@@ -133,7 +161,7 @@ class UserService:
 
     @staticmethod
     async def get_users_by_nome_limited(nome: str, db: AsyncSession) -> List[UserResponseLimited]:
-        users = await UserRepository.find_by_nome(nome, db)
+        users = await UserRepository.find_limited_by_nome(nome, db)
         return [
             UserResponseLimited(
                 id=user.id,
@@ -159,31 +187,33 @@ class UserService:
             logger.warning("user_not_found", user_id=user_id)
             raise UserNotFoundException(user_id=user_id)
 
-        user.email = new_email
-        user.senha = hash_password(new_password)
-        updated_user = await UserRepository.update(user, db)
+        senha_hash = await hash_password_async(new_password)
+        await UserRepository.update_credentials(user_id, new_email, senha_hash, db)
+        await ReadYourWrites.mark(user_id)
         logger.info("user_updated", user_id=user_id)
 
+        user_response = UserResponse(
+            id=user.id,
+            nome=user.nome,
+            sobrenome=user.sobrenome,
+            cpf=user.cpf,
+            email=user.email,
+            cep=user.cep,
+            logradouro=user.logradouro,
+            numero=user.numero,
+            complemento=user.complemento,
+            bairro=user.bairro,
+            cidade=user.cidade,
+            estado=user.estado
+        )
+
         cache_key = f"user:{user_id}"
         try:
-            await set_cache(cache_key, updated_user, expire=300)
+            await TieredCache.set(cache_key, user_response, expire=300, broadcast=True)
         except Exception as e:
             logger.warning("cache_set_failed", user_id=user_id, error=str(e))
 
-        return UserResponse(
-            id=updated_user.id,
-            nome=updated_user.nome,
-            sobrenome=updated_user.sobrenome,
-            cpf=updated_user.cpf,
-            email=updated_user.email,
-            cep=updated_user.cep,
-            logradouro=updated_user.logradouro,
-            numero=updated_user.numero,
-            complemento=updated_user.complemento,
-            bairro=updated_user.bairro,
-            cidade=updated_user.cidade,
-            estado=updated_user.estado
-        )
+        return user_response
 
     @staticmethod
     async def delete_user(user_id: int, db: AsyncSession, current_user_id: int) -> dict:
@@ -197,11 +227,13 @@ class UserService:
             raise UserNotFoundException(user_id=user_id)
 
         await UserRepository.delete(user, db)
+        await ReadYourWrites.mark(user_id)
+        await SessionService.forget_user(user_id)
         logger.info("user_deleted", user_id=user_id)
 
         cache_key = f"user:{user_id}"
         try:
-            await delete_cache(cache_key)
+            await TieredCache.delete(cache_key)
         except Exception as e:
             logger.warning("cache_delete_failed", user_id=user_id, error=str(e))
 
@@ -0,0 +1,96 @@
+from collections import deque
+from email import message_from_bytes
+from email.header import decode_header, make_header
+from typing import Any, Deque, Dict, Optional
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+from app.core.config import settings
+from app.core.logging import get_logger
+import asyncio
+import threading
+import time
+
+logger = get_logger(__name__)
+
+
+def _accept_any(server, session, envelope, mechanism, auth_data) -> AuthResult:
+    return AuthResult(success=True)
+
+
+class _SinkHandler:
+
+    async def handle_DATA(self, server, session, envelope) -> str:
+        if settings.smtp_sink_latency_ms > 0:
+            await asyncio.sleep(settings.smtp_sink_latency_ms / 1000)
+        SMTPSink.store(envelope.mail_from, list(envelope.rcpt_tos), envelope.content)
+        return "250 Message accepted for delivery"
+
+
+class SMTPSink:
+    _controller: Optional[Controller] = None
+    _messages: Deque[Dict[str, Any]] = deque(maxlen=settings.smtp_sink_max_messages)
+    _received: int = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def store(cls, mail_from: str, rcpt_tos: list, content: bytes) -> None:
+        message = message_from_bytes(content)
+        with cls._lock:
+            cls._received += 1
+            cls._messages.append({
+                "mail_from": mail_from,
+                "rcpt_tos": rcpt_tos,
+                "subject": str(make_header(decode_header(message.get("Subject", "")))),
+                "received_at": time.time(),
+                "size": len(content),
+                "content": content
+            })
+
+    @classmethod
+    def start(cls, host: Optional[str] = None, port: Optional[int] = None) -> bool:
+        if cls._controller is not None:
+            return True
+
+        controller = Controller(
+            _SinkHandler(),
+            hostname=host or settings.smtp_sink_host,
+            port=port or settings.smtp_sink_port,
+            auth_require_tls=False,
+            authenticator=_accept_any
+        )
+        try:
+            controller.start()
+        except Exception as e:
+            # Com vários workers só o primeiro consegue abrir a porta; os demais usam o mesmo sink
+            logger.warning("smtp_sink_unavailable", host=controller.hostname, port=controller.port, error=str(e))
+            return False
+
+        cls._controller = controller
+        logger.info("smtp_sink_started", host=controller.hostname, port=controller.port)
+        return True
+
+    @classmethod
+    def stop(cls) -> None:
+        if cls._controller is not None:
+            cls._controller.stop()
+            cls._controller = None
+            logger.info("smtp_sink_stopped", received=cls._received)
+
+    @classmethod
+    def messages(cls) -> list:
+        with cls._lock:
+            return list(cls._messages)
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._messages.clear()
+            cls._received = 0
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        return {
+            "running": cls._controller is not None,
+            "received": cls._received,
+            "stored": len(cls._messages)
+        }
@@ -0,0 +1,104 @@
+from typing import Any, Dict, Optional
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from app.core.config import settings
+import asyncio
+import httpx
+import random
+
+UFS = ("SP", "RJ", "MG", "RS", "PR", "BA", "PE", "CE", "SC", "GO")
+
+
+class ViaCEPStubConfig(BaseModel):
+    latency_ms: float = settings.viacep_stub_latency_ms
+    jitter_ms: float = settings.viacep_stub_jitter_ms
+    error_rate: float = settings.viacep_stub_error_rate
+    timeout_rate: float = settings.viacep_stub_timeout_rate
+    not_found_prefix: str = settings.viacep_stub_not_found_prefix
+
+
+class ViaCEPStubStats:
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.not_found = 0
+
+
+class TimeoutASGITransport(httpx.ASGITransport):
+    """ASGITransport que respeita o timeout de leitura do cliente, como uma conexão TCP real."""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        timeout = request.extensions.get("timeout", {}).get("read")
+        if timeout is None:
+            return await super().handle_async_request(request)
+        try:
+            return await asyncio.wait_for(super().handle_async_request(request), timeout)
+        except asyncio.TimeoutError as e:
+            raise httpx.ReadTimeout("Timeout simulado pelo stub do ViaCEP", request=request) from e
+
+
+def fake_address(cep: str) -> Dict[str, Any]:
+    number = int(cep)
+    return {
+        "cep": f"{cep[:5]}-{cep[5:]}",
+        "logradouro": f"Rua {number % 9973}",
+        "complemento": "",
+        "bairro": f"Bairro {number % 311}",
+        "localidade": f"Cidade {number % 97}",
+        "uf": UFS[number % len(UFS)],
+        "ibge": str(1000000 + number % 8999999),
+        "gia": "",
+        "ddd": str(11 + number % 89),
+        "siafi": str(number % 9999).zfill(4)
+    }
+
+
+def create_viacep_stub(config: Optional[ViaCEPStubConfig] = None) -> FastAPI:
+    stub = FastAPI(title="ViaCEP stub", docs_url=None, redoc_url=None, openapi_url=None)
+    stub.state.config = config or ViaCEPStubConfig()
+    stub.state.stats = ViaCEPStubStats()
+
+    @stub.get("/ws/{cep}/json/")
+    async def consultar(cep: str):
+        current: ViaCEPStubConfig = stub.state.config
+        stats: ViaCEPStubStats = stub.state.stats
+        stats.requests += 1
+
+        roll = random.random()
+        if roll < current.timeout_rate:
+            stats.timeouts += 1
+            await asyncio.sleep(settings.viacep_timeout * 2)
+            return JSONResponse(status_code=504, content={"detail": "Timeout"})
+
+        await asyncio.sleep(max(0.0, random.gauss(current.latency_ms, current.jitter_ms)) / 1000)
+
+        if roll < current.timeout_rate + current.error_rate:
+            stats.errors += 1
+            return JSONResponse(status_code=503, content={"detail": "Serviço indisponível"})
+
+        if len(cep) != 8 or not cep.isdigit():
+            return JSONResponse(status_code=400, content={"erro": "CEP inválido"})
+
+        if current.not_found_prefix and cep.startswith(current.not_found_prefix):
+            stats.not_found += 1
+            return {"erro": True}
+
+        return fake_address(cep)
+
+    @stub.get("/_stub/config")
+    async def get_config():
+        return stub.state.config
+
+    @stub.put("/_stub/config")
+    async def update_config(config: ViaCEPStubConfig):
+        stub.state.config = config
+        return config
+
+    @stub.get("/_stub/stats")
+    async def get_stats():
+        return vars(stub.state.stats)
+
+    return stub
@@ -1,14 +1,38 @@
-from fastapi import FastAPI
+import time
+
+_boot_started = time.perf_counter()
+
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
+from starlette.routing import Match
 from app.routers import user_router
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import init_db, get_pool_stats
 from app.core.logging import setup_logging, get_logger
+from app.core.security import PasswordHashPool, CipherProvider, get_blind_index_key
+from app.core.cache import RedisCache, TieredCache, LocalCache, SingleFlight
+from app.services.cep_service import ViaCEPClient
+from app.services.cep_database import LocalCEPDatabase
+from app.services.email_queue import EmailWorker
+from app.services.email_service import SMTPConnectionPool
+from app.services.email_templates import EmailTemplateRegistry
+from app.services.outbox_relay import OutboxRelay
+from app.services.session_service import SessionFlusher
+from app.core.timing import start_request_timing, finish_request_timing
+from app.core.metrics import (
+    CONTENT_TYPE,
+    CallbackMetric,
+    render_metrics,
+    http_requests_total,
+    http_request_duration_seconds,
+    http_requests_in_flight
+)
 from contextlib import asynccontextmanager
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
+import asyncio
+import hmac
+import os
+import random
 from sqlalchemy.exc import SQLAlchemyError
 from redis.exceptions import RedisError
 
@@ -38,11 +62,41 @@ async def lifespan(app: FastAPI):
     logger.info("application_startup", environment=settings.environment)
     await init_db()
     logger.info("database_initialized")
+    await asyncio.to_thread(CipherProvider.require)
+    get_blind_index_key()
+    if settings.smtp_sink_enabled:
+        from app.stubs.smtp_sink import SMTPSink
+        SMTPSink.start()
+    TieredCache.start_invalidation_listener()
+    ViaCEPClient.get_client()
+    if settings.cep_database_path:
+        LocalCEPDatabase.open(settings.cep_database_path)
+    EmailTemplateRegistry.warm()
+    if settings.email_worker_in_process:
+        EmailWorker.start()
+    if settings.outbox_relay_in_process:
+        OutboxRelay.start()
+    SessionFlusher.start()
+    logger.info(
+        "application_ready",
+        pid=os.getpid(),
+        startup_ms=round((time.perf_counter() - _boot_started) * 1000, 2)
+    )
     yield
+    await SessionFlusher.stop()
+    await OutboxRelay.stop()
+    await EmailWorker.stop()
+    await SMTPConnectionPool.close()
+    if settings.smtp_sink_enabled:
+        from app.stubs.smtp_sink import SMTPSink
+        SMTPSink.stop()
+    await TieredCache.stop_invalidation_listener()
+    await ViaCEPClient.close()
+    LocalCEPDatabase.close()
+    await RedisCache.close()
+    PasswordHashPool.shutdown()
     logger.info("application_shutdown")
 
-limiter = Limiter(key_func=get_remote_address)
-
 app = FastAPI(
     title="Wild Bank",
     description="""
@@ -77,21 +131,91 @@ app = FastAPI(
     ]
 )
 
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 app.add_exception_handler(AppException, app_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(SQLAlchemyError, sqlalchemy_exception_handler)
 app.add_exception_handler(RedisError, redis_exception_handler)
 app.add_exception_handler(Exception, generic_exception_handler)
 
+CallbackMetric("cache_hits_total", "Acertos de cache por camada", "counter",
+               lambda: {"l1": LocalCache.stats()["hits"], "l2": RedisCache.stats()["hits"]}, "tier")
+CallbackMetric("cache_misses_total", "Falhas de cache por camada", "counter",
+               lambda: {"l1": LocalCache.stats()["misses"], "l2": RedisCache.stats()["misses"]}, "tier")
+CallbackMetric("cache_single_flight_coalesced_total", "Requisições coalescidas em cache misses", "counter",
+               lambda: SingleFlight.stats()["coalesced"])
+CallbackMetric("password_hash_queue_depth", "Operações bcrypt aguardando worker", "gauge",
+               lambda: PasswordHashPool.stats()["queue_depth"])
+CallbackMetric("password_hash_rejected_total", "Operações bcrypt rejeitadas por saturação", "counter",
+               lambda: PasswordHashPool.stats()["rejected"])
+CallbackMetric("db_pool_connections", "Conexões do pool do banco", "gauge",
+               lambda: {key: get_pool_stats()[key] for key in ("checked_out", "checked_in", "overflow")}, "state")
+CallbackMetric("smtp_pool_connections", "Conexões SMTP do pool", "gauge",
+               lambda: {key: SMTPConnectionPool.stats()[key] for key in ("idle", "in_use")}, "state")
+CallbackMetric("smtp_connections_opened_total", "Sessões SMTP abertas (connect + login)", "counter",
+               lambda: SMTPConnectionPool.stats()["opened"])
+CallbackMetric("db_pool_wait_seconds_total", "Tempo total aguardando conexão do pool", "counter",
+               lambda: get_pool_stats()["wait_seconds_total"])
+
+
+def _route_template(request: Request) -> str:
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    if request.url.path == "/metrics":
+        return await call_next(request)
+
+    method = request.method
+    route = _route_template(request)
+    http_requests_in_flight.inc(method=method, route=route)
+    started = time.perf_counter()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        http_requests_in_flight.dec(method=method, route=route)
+        elapsed = time.perf_counter() - started
+        http_requests_total.inc(method=method, route=route, status=status)
+        http_request_duration_seconds.observe(elapsed, method=method, route=route, status=status)
+
+
+@app.middleware("http")
+async def request_timing_middleware(request: Request, call_next):
+    if not settings.request_timing_enabled or random.random() >= settings.request_timing_sample_rate:
+        return await call_next(request)
+
+    token = start_request_timing()
+    try:
+        response = await call_next(request)
+    finally:
+        timings = finish_request_timing(token)
+
+    response.headers["Server-Timing"] = timings.server_timing_header()
+    logger.info(
+        "request_timing",
+        method=request.method,
+        route=_route_template(request),
+        status=response.status_code,
+        total_ms=timings.total_ms(),
+        spans=timings.as_dict()
+    )
+    return response
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.allowed_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Server-Timing"],
 )
 
 app.include_router(user_router.router)
@@ -118,3 +242,19 @@ async def health_check():
         "environment": settings.environment,
         "version": "2.0.0"
     }
+
+def require_metrics_access(request: Request) -> None:
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if settings.metrics_token:
+        authorization = request.headers.get("authorization", "")
+        if not hmac.compare_digest(authorization.encode(), f"Bearer {settings.metrics_token}".encode()):
+            raise HTTPException(status_code=401, detail="Token inválido.")
+
+@app.get("/metrics", tags=["health"], include_in_schema=False, dependencies=[Depends(require_metrics_access)])
+async def metrics():
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
+
+@app.get("/health/db-pool", tags=["health"], dependencies=[Depends(require_metrics_access)])
+async def database_pool_health():
+    return get_pool_stats()
@@ -0,0 +1,19 @@
+import asyncio
+import sys
+
+from app.core.database import async_session_maker
+from app.core.logging import setup_logging, get_logger
+from app.repositories.user_repository import UserRepository
+
+logger = get_logger(__name__)
+
+
+async def main(batch_size: int) -> None:
+    async with async_session_maker() as session:
+        total = await UserRepository.backfill_cpf_hashes(session, batch_size=batch_size)
+    logger.info("cpf_hash_backfill_finished", total=total)
+
+
+if __name__ == "__main__":
+    setup_logging()
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
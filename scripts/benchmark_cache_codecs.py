@@ -0,0 +1,52 @@
+import pickle
+import timeit
+
+from app.core.config import settings
+from app.core.serialization import CacheSerializer, msgpack, zstandard, lz4_frame
+from app.schemas.user_schema import UserResponse
+
+ITERATIONS = 20000
+
+SAMPLE = UserResponse(
+    id=123456,
+    nome="Maria",
+    sobrenome="Oliveira",
+    cpf="529.982.247-25",
+    email="maria.oliveira@example.com",
+    cep="01310-100",
+    logradouro="Avenida Paulista",
+    numero="1578",
+    complemento="Conjunto 42",
+    bairro="Bela Vista",
+    cidade="São Paulo",
+    estado="SP"
+)
+
+
+def _measure(name: str, dumps, loads) -> None:
+    data = dumps(SAMPLE)
+    encode_us = timeit.timeit(lambda: dumps(SAMPLE), number=ITERATIONS) / ITERATIONS * 1_000_000
+    decode_us = timeit.timeit(lambda: loads(data), number=ITERATIONS) / ITERATIONS * 1_000_000
+    assert loads(data) == SAMPLE
+    print(f"{name:<22}{len(data):>8}{encode_us:>14.2f}{decode_us:>14.2f}")
+
+
+def main() -> None:
+    CacheSerializer.register_model(UserResponse)
+
+    print(f"{'codec':<22}{'bytes':>8}{'encode (us)':>14}{'decode (us)':>14}")
+    _measure("pickle", pickle.dumps, pickle.loads)
+
+    available_codecs = ["json"] + (["msgpack"] if msgpack is not None else [])
+    available_compressions = ["none"] + (["zstd"] if zstandard is not None else []) + (["lz4"] if lz4_frame is not None else [])
+
+    for codec in available_codecs:
+        for compression in available_compressions:
+            settings.cache_codec = codec
+            settings.cache_compression = compression
+            settings.cache_compression_threshold = 0
+            _measure(f"{codec}+{compression}", CacheSerializer.dumps, CacheSerializer.loads)
+
+
+if __name__ == "__main__":
+    main()
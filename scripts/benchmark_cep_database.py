@@ -0,0 +1,55 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+from app.services.cep_database import build_cep_database, LocalCEPDatabase
+
+LOOKUPS = 200_000
+
+
+def _records(total: int):
+    rng = random.Random(42)
+    for cep in rng.sample(range(1_000_000, 99_999_999), total):
+        yield {
+            "cep": f"{cep:08d}",
+            "logradouro": f"Rua {cep % 9973}",
+            "complemento": "",
+            "bairro": f"Bairro {cep % 311}",
+            "localidade": f"Cidade {cep % 97}",
+            "uf": "SP",
+            "ibge": str(3500000 + cep % 1000),
+            "ddd": "11",
+        }
+
+
+def main(total: int) -> None:
+    records = list(_records(total))
+    ceps = [record["cep"] for record in records]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ceps.bin")
+        started = time.perf_counter()
+        build_cep_database(records, path)
+        build_seconds = time.perf_counter() - started
+        size_mb = os.path.getsize(path) / 1024 / 1024
+
+        LocalCEPDatabase.open(path)
+        rng = random.Random(7)
+        queries = [rng.choice(ceps) for _ in range(LOOKUPS)]
+        started = time.perf_counter()
+        for cep in queries:
+            LocalCEPDatabase.lookup(cep)
+        lookup_seconds = time.perf_counter() - started
+        LocalCEPDatabase.close()
+
+    print(f"registros:        {total}")
+    print(f"tamanho:          {size_mb:.2f} MB")
+    print(f"build:            {build_seconds:.2f} s")
+    print(f"lookups/s:        {LOOKUPS / lookup_seconds:,.0f}")
+    print(f"latência média:   {lookup_seconds / LOOKUPS * 1_000_000:.2f} us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
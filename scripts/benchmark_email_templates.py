@@ -0,0 +1,46 @@
+import os
+import sys
+import time
+
+from jinja2 import Template
+
+from app.services.email_templates import EmailTemplateRegistry, TEMPLATE_DIR
+
+CONTEXT = {
+    "user_name": "Maria da Silva",
+    "reset_link": "https://app.example.com/reset-password?token=abc123",
+    "expiration_hours": 1,
+}
+
+
+def _per_email(label: str, iterations: int, render) -> None:
+    render()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        render()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<32} {elapsed / iterations * 1_000_000:>10.1f} us/e-mail")
+
+
+def main(iterations: int) -> None:
+    with open(os.path.join(TEMPLATE_DIR, "pt_BR", "password_reset.html"), encoding="utf-8") as f:
+        source = f.read()
+
+    started = time.perf_counter()
+    EmailTemplateRegistry.warm()
+    print(f"{'carga do registro':<32} {(time.perf_counter() - started) * 1000:>10.1f} ms")
+
+    _per_email(
+        "Template(source) por chamada",
+        max(1, iterations // 20),
+        lambda: Template(source).render(app_name="WildBank", **CONTEXT)
+    )
+    _per_email(
+        "registro (html + texto + assunto)",
+        iterations,
+        lambda: EmailTemplateRegistry.render("password_reset", **CONTEXT)
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,57 @@
+import asyncio
+import sys
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+
+PAGE_SIZE = 100
+REPEAT = 20
+
+
+async def _seed(conn, rows: int) -> None:
+    await conn.execute(text("CREATE TEMP TABLE users_bench (LIKE users INCLUDING DEFAULTS INCLUDING INDEXES)"))
+    await conn.execute(text("""
+        INSERT INTO users_bench (id, nome, sobrenome, cpf, cpf_hash, email, senha,
+                                 cep, logradouro, numero, bairro, cidade, estado)
+        SELECT g, 'Nome', 'Sobrenome', 'cpf' || g, md5(g::text), 'user' || g || '@bench.local', 'x',
+               'cep', 'logradouro', '1', 'bairro', 'cidade', 'SP'
+        FROM generate_series(1, :rows) AS g
+    """), {"rows": rows})
+    await conn.execute(text("ANALYZE users_bench"))
+
+
+async def _timed(conn, query: str, params: dict) -> float:
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        await conn.execute(text(query), params)
+    return (time.perf_counter() - started) / REPEAT * 1000
+
+
+async def main(rows: int) -> None:
+    engine = create_async_engine(settings.database_url, echo=False)
+    async with engine.connect() as conn:
+        await _seed(conn, rows)
+
+        print(f"{'página':>8}{'offset (ms)':>14}{'cursor (ms)':>14}")
+        for page in (1, 100, 1000, rows // PAGE_SIZE):
+            offset = (page - 1) * PAGE_SIZE
+            offset_ms = await _timed(
+                conn,
+                "SELECT * FROM users_bench ORDER BY id OFFSET :offset LIMIT :limit",
+                {"offset": offset, "limit": PAGE_SIZE}
+            )
+            cursor_ms = await _timed(
+                conn,
+                "SELECT * FROM users_bench WHERE id > :after_id ORDER BY id LIMIT :limit",
+                {"after_id": offset, "limit": PAGE_SIZE}
+            )
+            print(f"{page:>8}{offset_ms:>14.2f}{cursor_ms:>14.2f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000))
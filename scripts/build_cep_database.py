@@ -0,0 +1,18 @@
+import csv
+import sys
+
+from app.services.cep_database import build_cep_database
+
+
+def main(csv_path: str, output_path: str) -> None:
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        total = build_cep_database(csv.DictReader(f), output_path)
+    print(f"{total} CEPs gravados em {output_path}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Uso: python -m scripts.build_cep_database <entrada.csv> <saida.bin>")
+        print("Colunas: cep,logradouro,complemento,bairro,localidade,uf,ibge,ddd")
+        sys.exit(1)
+    main(sys.argv[1], sys.argv[2])
@@ -0,0 +1,13 @@
+import sys
+
+from app.core.security import derive_encryption_key
+
+
+if __name__ == "__main__":
+    key = derive_encryption_key()
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "wb") as f:
+            f.write(key)
+        print(f"Chave derivada gravada em {sys.argv[1]}")
+    else:
+        print(key.decode())
@@ -0,0 +1,24 @@
+import asyncio
+import signal
+
+from app.core.cache import RedisCache
+from app.core.logging import setup_logging
+from app.services.email_queue import EmailWorker
+from app.services.email_service import SMTPConnectionPool
+
+
+async def main() -> None:
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, EmailWorker.request_stop)
+
+    try:
+        await EmailWorker.run()
+    finally:
+        await SMTPConnectionPool.close()
+        await RedisCache.close()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    asyncio.run(main())
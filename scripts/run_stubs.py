@@ -0,0 +1,34 @@
+import sys
+
+import uvicorn
+
+from app.core.config import settings
+from app.core.logging import setup_logging, get_logger
+from app.stubs.smtp_sink import SMTPSink
+from app.stubs.viacep_stub import create_viacep_stub
+
+logger = get_logger(__name__)
+
+
+def main(viacep_port: int) -> None:
+    SMTPSink.start()
+    stub = create_viacep_stub()
+
+    @stub.get("/_stub/smtp")
+    async def smtp_stats():
+        return SMTPSink.stats()
+
+    logger.info(
+        "local_stubs_started",
+        smtp=f"{settings.smtp_sink_host}:{settings.smtp_sink_port}",
+        viacep=f"http://127.0.0.1:{viacep_port}/ws/{{cep}}/json/"
+    )
+    try:
+        uvicorn.run(stub, host="127.0.0.1", port=viacep_port, log_level="warning")
+    finally:
+        SMTPSink.stop()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 8090)